@@ -0,0 +1,487 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import perf
+import sql_backend
+from memo import derived_cache
+
+# --- AGREGACE NAD CELOČÍSELNÝMI KLÍČI ---
+# Logika 1. a 2. kola: Kapacitu bereme jen kde Kolo=1, ostatní metriky sumujeme přes všechna kola.
+METRIC_COLS = ['Prihlaseni', 'Prijati', 'Prihlaseni_P1', 'Prihlaseni_P2', 'Prihlaseni_P3',
+               'Prijati_P1', 'Duvod_Kapacita', 'Duvod_Podminky', 'Duvod_Vyssi_Priorita']
+SUM_COLS = ['Kapacita'] + METRIC_COLS
+DERIVED_COLS = ['Uspesnost_Pct', 'Previs_Poptavky', 'Uspesnost_P1_Pct', 'Index_Odlivu']
+
+# Popisky, které se k agregátům dotahují z dimenzí (pořadí sloupců jako dřív v df_final)
+LABEL_COLS = ['Skola_Obor', 'Škola', 'Obor', 'Zřizovatel', 'Okres']
+
+# Odkud se který popisek bere: sloupec -> (dimenzní tabulka, klíč)
+LABEL_SOURCES = {
+    'Skola_Obor': ('dim_unit', 'unit_id'),
+    'Škola': ('dim_school', 'school_id'),
+    'Skola_Label': ('dim_school', 'school_id'),
+    'REDIZO': ('dim_school', 'school_id'),
+    'Zřizovatel': ('dim_school', 'school_id'),
+    'Obor': ('dim_obor', 'obor_id'),
+    'Kraj': ('dim_location', 'location_id'),
+    'Okres': ('dim_location', 'location_id'),
+    'Město': ('dim_location', 'location_id'),
+}
+
+
+def add_metrics(df):
+    # Odvozené poměrové metriky (vrací novou tabulku)
+    with perf.stage('metrics'):
+        df = df.copy()
+        df['Uspesnost_Pct'] = (df['Prijati'] / df['Prihlaseni'] * 100).fillna(0)
+        df['Previs_Poptavky'] = (df['Prihlaseni'] / df['Kapacita']).fillna(0)
+        df['Uspesnost_P1_Pct'] = (df['Prijati_P1'] / df['Prihlaseni_P1'] * 100).fillna(0)
+        # Index odlivu (kolik % přihlášených uteklo na lepší školu)
+        df['Index_Odlivu'] = (df['Duvod_Vyssi_Priorita'] / df['Prihlaseni'] * 100).fillna(0)
+        return df
+
+
+def attach_labels(tables, rows, cols):
+    # Popisky pro řádky s celočíselnými klíči; ve dimenzích platí id == pozice -> take()
+    out = {}
+    for col in cols:
+        dim, key = LABEL_SOURCES[col]
+        out[col] = tables[dim][col].take(rows[key].to_numpy()).to_numpy()
+    return pd.DataFrame(out, index=rows.index)
+
+
+# --- OLAP KOSTKA: Rok x jednotka (škola x obor x lokalita) ---
+# Počítá se jednou při načtení dat. Filtry v sidebaru jsou pak jen výřezy kostky
+# a další agregace (po oborech, krajích, školách) se sčítají z ní, ne z řádkových dat.
+def build_cube(df, dims):
+    first_round = (df['Kolo'] == 1).to_numpy()
+    parts = {'Rok': df['Rok'].to_numpy(),
+             'unit_id': df['unit_id'].to_numpy(),
+             'Kapacita': np.where(first_round, df['Kapacita'].to_numpy(dtype='int64'), 0),
+             'Ma_Kolo1': first_round.astype('int32')}
+    parts.update({col: df[col].to_numpy(dtype='int64') for col in METRIC_COLS})
+    cube = pd.DataFrame(parts).groupby(['Rok', 'unit_id'], sort=True).sum().reset_index()
+    cube['Ma_Kolo1'] = cube['Ma_Kolo1'] > 0
+
+    unit = dims['dim_unit'].take(cube['unit_id'].to_numpy())
+    for key in ['school_id', 'obor_id', 'location_id']:
+        cube[key] = unit[key].to_numpy()
+
+    cube = add_metrics(cube)
+    # Do df_final patří jen jednotky s řádkem v 1. kole (dřív inner merge) a nenulovou kapacitou.
+    # Ostatní řádky v kostce zůstávají, protože meziroční přehledy sčítají všechny přihlášky.
+    cube['Platny'] = cube['Ma_Kolo1'] & (cube['Kapacita'] > 0)
+    return cube[['Rok', 'unit_id', 'school_id', 'obor_id', 'location_id'] + SUM_COLS
+                + DERIVED_COLS + ['Ma_Kolo1', 'Platny']]
+
+
+# --- MEZIROČNÍ ZMĚNY (materializované při načtení dat) ---
+# Pro každou dvojici po sobě jdoucích let (Rok_Od = Rok_Do - 1) a každou úroveň
+# součty za oba roky + absolutní a procentní změna přihlášek, přijatých, kapacity
+# a podílu 1. priorit. Počítá se ze všech řádků kostky (i jednotek mimo df_final),
+# stejně jako dřív meziroční pivoty. Tabulky jdou do Parquet cache spolu s kostkou.
+# Součty (*_Od / *_Do) jsou aditivní, takže výběr více krajů / oborů se jen sečte
+# a změny se přepočítají (regroup_deltas); Pocet_* = počet řádků kostky (0 = v roce chybí).
+DELTA_SUMS = ['Pocet', 'Prihlaseni', 'Prijati', 'Kapacita', 'Prihlaseni_P1']
+DELTA_METRICS = ['Prihlaseni', 'Prijati', 'Kapacita', 'Podil_P1']
+DELTA_LEVELS = {
+    'delta_obor': ['Obor'],
+    'delta_kraj': ['Kraj'],
+    'delta_kraj_obor': ['Kraj', 'Obor'],
+    'delta_skola': ['school_id'],
+    'delta_skola_obor': ['school_id', 'obor_id'],
+}
+
+
+def year_pairs(years):
+    years = sorted(set(int(y) for y in years))
+    return [(y - 1, y) for y in years if y - 1 in years]
+
+
+def delta_changes(df):
+    # Z aditivních součtů *_Od / *_Do dopočítá podíl 1. priorit a změny (vrací novou tabulku)
+    df = df.copy()
+    for side in ['Od', 'Do']:
+        apps = df[f'Prihlaseni_{side}']
+        share = (df[f'Prihlaseni_P1_{side}'] / apps * 100).fillna(0)
+        df[f'Podil_P1_{side}'] = share.where(df[f'Pocet_{side}'] > 0)
+    for col in DELTA_METRICS:
+        df[f'{col}_Zmena_Abs'] = df[f'{col}_Do'] - df[f'{col}_Od']
+        # Stejně jako dřív: 0/0 -> 0, nárůst z nuly -> inf
+        pct = df[f'{col}_Zmena_Abs'] / df[f'{col}_Od'] * 100
+        df[f'{col}_Zmena_Pct'] = pct.fillna(0) if col != 'Podil_P1' else pct
+    return df
+
+
+def year_deltas(tables, rows, keys):
+    # Meziroční tabulka pro výřez kostky `rows` po klíčích `keys` (popisky nebo *_id)
+    label_cols = [col for col in keys if col not in rows]
+    df = pd.concat([attach_labels(tables, rows, label_cols),
+                    rows[[col for col in keys if col in rows] + ['Rok'] + DELTA_SUMS[1:]]], axis=1)
+    df['Pocet'] = 1
+    sums = df.groupby(keys + ['Rok'], observed=True, sort=True)[DELTA_SUMS].sum()
+
+    years = sums.index.get_level_values('Rok')
+    parts = []
+    for rok_od, rok_do in year_pairs(years.unique()):
+        before = sums[years == rok_od].droplevel('Rok').add_suffix('_Od')
+        after = sums[years == rok_do].droplevel('Rok').add_suffix('_Do')
+        pair = before.join(after, how='outer').fillna(0).astype('int64').reset_index()
+        pair.insert(0, 'Rok_Od', rok_od)
+        pair.insert(1, 'Rok_Do', rok_do)
+        parts.append(pair)
+    if not parts:
+        columns = ['Rok_Od', 'Rok_Do'] + keys + [f'{col}_{side}' for side in ['Od', 'Do'] for col in DELTA_SUMS]
+        return delta_changes(pd.DataFrame(columns=columns, dtype='int64'))
+    return delta_changes(pd.concat(parts, ignore_index=True).sort_values(['Rok_Do'] + keys, ignore_index=True))
+
+
+def regroup_deltas(df, keys):
+    # Sečte aditivní součty meziroční tabulky na hrubší úroveň a přepočítá změny
+    sums = [f'{col}_{side}' for side in ['Od', 'Do'] for col in DELTA_SUMS]
+    out = df.groupby(['Rok_Od', 'Rok_Do'] + keys, observed=True, sort=True)[sums].sum().reset_index()
+    return delta_changes(out)
+
+
+def build_deltas(tables):
+    return {name: year_deltas(tables, tables['cube'], keys) for name, keys in DELTA_LEVELS.items()}
+
+
+def slice_cube(tables, rok=None, kraj=None, mesto=None, obor=None, skola=None, valid_only=True):
+    # Výřez kostky podle filtrů. Pokud je k dispozici invertovaný index (filter_index.py),
+    # řádky se najdou průnikem pozic; jinak se textové hodnoty převedou na id přes dimenze.
+    cube = tables['cube']
+    index = tables.get('filter_index')
+    if index is not None:
+        rows = cube.iloc[index.positions(Rok=rok, Kraj=kraj, Město=mesto, Obor=obor, Škola=skola)]
+        return rows[rows['Platny'].to_numpy()] if valid_only else rows
+
+    mask = np.ones(len(cube), dtype=bool)
+    if rok is not None:
+        mask &= cube['Rok'].to_numpy() == rok
+    if kraj or mesto:
+        loc = tables['dim_location']
+        loc_mask = np.ones(len(loc), dtype=bool)
+        if kraj:
+            loc_mask &= loc['Kraj'].isin(kraj).to_numpy()
+        if mesto:
+            loc_mask &= loc['Město'].isin(mesto).to_numpy()
+        mask &= np.isin(cube['location_id'].to_numpy(), loc['location_id'].to_numpy()[loc_mask])
+    if obor:
+        dim = tables['dim_obor']
+        mask &= np.isin(cube['obor_id'].to_numpy(), dim.loc[dim['Obor'].isin(obor), 'obor_id'].to_numpy())
+    if skola:
+        dim = tables['dim_school']
+        mask &= np.isin(cube['school_id'].to_numpy(), dim.loc[dim['Škola'].isin(skola), 'school_id'].to_numpy())
+    if valid_only:
+        mask &= cube['Platny'].to_numpy()
+    return cube[mask]
+
+
+def final_view(tables, rows):
+    # df_final pro zobrazení: popisky + součty + metriky, seřazeno podle Skola_Obor
+    with perf.stage('merge'):
+        labels = attach_labels(tables, rows, LABEL_COLS + ['REDIZO'])
+        out = pd.concat([labels, rows[SUM_COLS + DERIVED_COLS + ['unit_id']]], axis=1)
+        out = out[LABEL_COLS + SUM_COLS + DERIVED_COLS + ['REDIZO', 'unit_id']]
+        return out.sort_values('Skola_Obor', ignore_index=True)
+
+
+def rollup(tables, rows, by):
+    # Součty z výřezu kostky podle libovolných popisků (např. ['Obor'], ['Kraj'], ['Obor', 'Rok'])
+    label_cols = [col for col in by if col in LABEL_SOURCES]
+    df = pd.concat([attach_labels(tables, rows, label_cols), rows[[c for c in by if c not in LABEL_SOURCES] + SUM_COLS]], axis=1)
+    out = df.groupby(by, observed=True, sort=True)[SUM_COLS].sum().reset_index()
+    return add_metrics(out)
+
+
+# --- ODVOZENÉ TABULKY (memoizované podle stavu filtrů) ---
+# Čisté funkce nad (tables, FilterState, ...). Výsledky jsou sdílené mezi sessions
+# přes memo.derived_cache, proto je volající nesmí měnit.
+FilterState = namedtuple('FilterState', ['rok', 'kraj', 'mesto', 'obor'])
+
+
+def filter_state(rok=None, kraj=None, mesto=None, obor=None):
+    # Normalizace: pořadí výběru v multiselectu nehraje roli -> seřazené tuply
+    def norm(values):
+        return tuple(sorted(set(values or ())))
+    return FilterState(None if rok is None else int(rok), norm(kraj), norm(mesto), norm(obor))
+
+
+def _slice(tables, state, rok=None, valid_only=True):
+    return slice_cube(tables, rok=rok, kraj=list(state.kraj), mesto=list(state.mesto),
+                      obor=list(state.obor), valid_only=valid_only)
+
+
+# Se zapnutým SQL backendem (sql_backend.py) se součty počítají dotazem nad Parquet
+# partitions a tady se z nich jen dopočítají metriky stejným kódem.
+@derived_cache.memoize
+def final_table(tables, state):
+    # df_final: škola x obor pro vybraný rok a filtry
+    if sql_backend.active(tables):
+        return final_view(tables, add_metrics(sql_backend.unit_sums(tables, state)))
+    with perf.stage('slice'):
+        rows = _slice(tables, state, rok=state.rok)
+    return final_view(tables, rows)
+
+
+@derived_cache.memoize
+def obory_table(tables, state):
+    # Agregace dle oborů (z kostky se stejným výřezem jako df_final)
+    if sql_backend.active(tables):
+        df_obory = add_metrics(sql_backend.obor_sums(tables, state))
+    else:
+        df_obory = rollup(tables, _slice(tables, state, rok=state.rok), ['Obor'])
+    df_obory = df_obory.rename(columns={'Previs_Poptavky': 'Previs'})[['Obor', 'Kapacita', 'Prihlaseni', 'Prijati', 'Previs']]
+    return df_obory[df_obory['Kapacita'] > 0]  # Ošetření dělení nulou
+
+
+@derived_cache.memoize
+def yoy_tables(tables, state):
+    # Meziroční změny po oborech pro všechny dvojice let (ignorujeme filtr roku,
+    # ale respektujeme kraj/město/obor). Bez filtru měst jde o výběr z materializovaných
+    # tabulek (delta_obor, delta_kraj_obor), filtr měst se dopočítá z výřezu kostky.
+    if sql_backend.active(tables):
+        return delta_changes(sql_backend.yoy_sums(tables, state))
+    if state.mesto:
+        deltas = year_deltas(tables, _slice(tables, state, valid_only=False), ['Obor'])
+    elif state.kraj:
+        deltas = tables['delta_kraj_obor']
+        deltas = regroup_deltas(deltas[deltas['Kraj'].isin(state.kraj)], ['Obor'])
+    else:
+        deltas = tables['delta_obor']
+    if state.obor:
+        deltas = deltas[deltas['Obor'].isin(state.obor)]
+    return deltas
+
+
+def yoy_pair(deltas, rok=None):
+    # Dvojice let k zobrazení: končící vybraným rokem, jinak poslední dostupná; None = chybí data
+    pairs = sorted(set(zip(deltas['Rok_Od'].tolist(), deltas['Rok_Do'].tolist())))
+    if not pairs:
+        return None
+    return next((pair for pair in pairs if pair[1] == rok), pairs[-1])
+
+
+def yoy_movers(deltas, pair, n=5):
+    # Obory s největším absolutním nárůstem / poklesem přihlášek mezi roky `pair`
+    rok_od, rok_do = pair
+    df_pivot = deltas[deltas['Rok_Do'] == rok_do].set_index('Obor')[
+        ['Prihlaseni_Od', 'Prihlaseni_Do', 'Prihlaseni_Zmena_Abs', 'Prihlaseni_Zmena_Pct']]
+    df_pivot.columns = pd.Index([str(rok_od), str(rok_do), 'Zmena_Abs', 'Zmena_Pct'], name='Rok')
+    # Top skokani (absolutní nárůst) - pouze kladné
+    growers = df_pivot[df_pivot['Zmena_Abs'] > 0].sort_values('Zmena_Abs', ascending=False).head(n)
+    # Top propadáky - pouze záporné
+    losers = df_pivot[df_pivot['Zmena_Abs'] < 0].sort_values('Zmena_Abs', ascending=True).head(n)
+    return growers, losers
+
+
+def top_picks(df_final, n=10):
+    # Top 'Jistoty': školy s převisem < 1.2 a úspěšností > 80%
+    picks = df_final[(df_final['Previs_Poptavky'] < 1.2) & (df_final['Uspesnost_Pct'] > 80)]
+    return picks[['Skola_Obor', 'Uspesnost_Pct']].sort_values('Uspesnost_Pct', ascending=False).head(n)
+
+
+def school_table(tables, state, redizo):
+    # Řádky školy pro vybraný rok z indexu škol (school_index.py), zúžené na filtry
+    # kraj / město / obor -> stejné řádky jako df_final pro tuto školu
+    rows = tables['school_index'].school_rows(redizo, state.rok)
+    mask = np.ones(len(rows), dtype=bool)
+    if state.kraj or state.mesto:
+        loc = tables['dim_location'].take(rows['location_id'].to_numpy())
+        if state.kraj:
+            mask &= loc['Kraj'].isin(state.kraj).to_numpy()
+        if state.mesto:
+            mask &= loc['Město'].isin(state.mesto).to_numpy()
+    if state.obor:
+        mask &= rows['Obor'].isin(state.obor).to_numpy()
+    return rows[mask]
+
+
+@derived_cache.memoize
+def school_options(tables, state):
+    # REDIZO škol v df_final seřazená podle popisku (pro selectbox na stránce "Detail školy")
+    index = tables['school_index']
+    return sorted(final_table(tables, state)['REDIZO'].unique().tolist(), key=index.label)
+
+
+# --- BENCHMARK VŮČI TRHU (leave-one-out) ---
+# Pro všechny školy najednou: trh = součty všech platných jednotek minus vlastní
+# příspěvek školy, takže žádná škola se nesrovnává sama se sebou a není potřeba
+# procházet konkurenci zvlášť pro každou školu. Úrovně trhu:
+#   Trh_Obor  stejné obory v celé ČR
+#   Trh_Kraj  stejné obory ve stejném kraji
+#   Trh_CR    celý trh (všechny obory)
+# Průměry jsou vážené kapacitou / přihláškami (součet přihlášek / součet kapacity).
+BENCHMARK_SUMS = ['Pocet', 'Kapacita', 'Prihlaseni', 'Prijati']
+BENCHMARK_LEVELS = ['Trh_Obor', 'Trh_Kraj', 'Trh_CR']
+
+
+def _ratios(df, prefix=''):
+    # Převis a úspěšnost ze součtů, bez dělení nulou (jako dřív v detailu školy)
+    cap, apps, acc = (df[f'{prefix}{col}'].to_numpy(dtype=float) for col in ['Kapacita', 'Prihlaseni', 'Prijati'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df[f'{prefix}Previs'] = np.where(cap > 0, apps / cap, 0.0)
+        df[f'{prefix}Uspesnost_Pct'] = np.where(apps > 0, acc / apps * 100, 0.0)
+    return df
+
+
+def _market(df, totals, keys, level):
+    # Trh úrovně `level` = celkové součty pro klíč minus vlastní součty řádku
+    market = totals.reindex(pd.MultiIndex.from_frame(df[keys]) if len(keys) > 1 else df[keys[0]]).to_numpy()
+    for i, col in enumerate(BENCHMARK_SUMS):
+        df[f'{level}_{col}'] = market[:, i] - df[col].to_numpy()
+    return _ratios(df, f'{level}_')
+
+
+@derived_cache.memoize
+def market_benchmark(tables, rok):
+    # {'programs': škola x obor x kraj, 'schools': škola} pro daný rok, se součty
+    # vlastními i tržními (aby šly skládat podmnožiny oborů) a rozdílem vůči trhu
+    cube = tables['cube']
+    rows = cube[cube['Platny'].to_numpy() & (cube['Rok'].to_numpy() == rok)]
+    rows = rows.assign(Pocet=1, Kraj=tables['dim_location']['Kraj'].take(rows['location_id'].to_numpy()).to_numpy())
+    rows = rows[['school_id', 'obor_id', 'Kraj'] + BENCHMARK_SUMS]
+
+    total = rows[BENCHMARK_SUMS].sum().to_numpy()
+    by_obor = rows.groupby('obor_id')[BENCHMARK_SUMS].sum()
+    by_obor_kraj = rows.groupby(['obor_id', 'Kraj'], observed=True)[BENCHMARK_SUMS].sum()
+
+    # Úroveň oboru v ČR: vlastní příspěvek školy je součet přes všechny její lokality
+    programs_cr = rows.groupby(['school_id', 'obor_id'], sort=True)[BENCHMARK_SUMS].sum().reset_index()
+    programs_cr = _market(programs_cr, by_obor, ['obor_id'], 'Trh_Obor')
+    programs = rows.groupby(['school_id', 'obor_id', 'Kraj'], observed=True, sort=True)[BENCHMARK_SUMS].sum().reset_index()
+    programs = _market(_ratios(programs), by_obor_kraj, ['obor_id', 'Kraj'], 'Trh_Kraj')
+    obor_cols = [f'Trh_Obor_{col}' for col in BENCHMARK_SUMS + ['Previs', 'Uspesnost_Pct']]
+    programs = programs.merge(programs_cr[['school_id', 'obor_id'] + obor_cols], on=['school_id', 'obor_id'], how='left')
+
+    # Škola: tržní součty přes její obory (obor v ČR bez duplicit přes kraje) a celý trh bez školy
+    schools = programs.groupby('school_id', sort=True)[
+        BENCHMARK_SUMS + [f'Trh_Kraj_{col}' for col in BENCHMARK_SUMS]].sum()
+    schools = schools.join(programs_cr.groupby('school_id')[[f'Trh_Obor_{col}' for col in BENCHMARK_SUMS]].sum())
+    for i, col in enumerate(BENCHMARK_SUMS):
+        schools[f'Trh_CR_{col}'] = total[i] - schools[col].to_numpy()
+    schools = _ratios(schools.reset_index())
+    for level in BENCHMARK_LEVELS:
+        schools = _ratios(schools, f'{level}_')
+
+    for df in (programs, schools):
+        for level in BENCHMARK_LEVELS:
+            if f'{level}_Previs' in df:
+                df[f'{level}_Rozdil_Previs'] = df['Previs'] - df[f'{level}_Previs']
+                df[f'{level}_Rozdil_Uspesnost'] = df['Uspesnost_Pct'] - df[f'{level}_Uspesnost_Pct']
+
+    dim_school = tables['dim_school']
+    for df in (programs, schools):
+        df.insert(0, 'REDIZO', dim_school['REDIZO'].take(df['school_id'].to_numpy()).to_numpy())
+    programs.insert(1, 'Obor', tables['dim_obor']['Obor'].take(programs['obor_id'].to_numpy()).to_numpy())
+    schools.insert(1, 'Skola_Label', dim_school['Skola_Label'].take(schools['school_id'].to_numpy()).to_numpy())
+    # Pořadí podle převisu vůči stejným oborům v ČR (1 = nejvíc nad trhem)
+    schools['Poradi_Previs'] = schools['Trh_Obor_Rozdil_Previs'].rank(ascending=False, method='min').astype(int)
+    return {'programs': programs, 'schools': schools}
+
+
+# Sloupce tabulky "nad / pod trhem" (celá tabulka jde do CSV exportu)
+BENCHMARK_DISPLAY_COLS = [
+    'REDIZO', 'Skola_Label', 'Poradi_Previs',
+    'Previs', 'Trh_Obor_Previs', 'Trh_Obor_Rozdil_Previs', 'Trh_Kraj_Previs', 'Trh_CR_Previs',
+    'Uspesnost_Pct', 'Trh_Obor_Uspesnost_Pct', 'Trh_Obor_Rozdil_Uspesnost', 'Trh_Kraj_Uspesnost_Pct',
+]
+
+
+@derived_cache.memoize
+def school_benchmark(tables, state, redizo):
+    # Průměr konkurence ve stejných oborech (a stejném regionu, pokud je vybrán), bez školy samotné.
+    # Bez filtru / s jedním krajem jde o výběr z předpočítaného market_benchmark,
+    # jiné kombinace filtrů (města, víc krajů) se dopočítají průchodem df_final.
+    if sql_backend.active(tables):
+        return _benchmark_result(*sql_backend.benchmark_sums(tables, state, redizo))
+    if state.mesto or len(state.kraj) > 1:
+        return _scan_benchmark(tables, state, redizo)
+    programs = market_benchmark(tables, state.rok)['programs']
+    # Tabulka je seřazená podle school_id -> řádky školy jsou souvislý blok
+    school_id = tables['school_index'].school_ids.get(redizo)
+    ids = programs['school_id'].to_numpy()
+    rows = programs.iloc[np.searchsorted(ids, school_id, 'left'):np.searchsorted(ids, school_id, 'right')]
+    if state.obor:
+        rows = rows[rows['Obor'].isin(state.obor).to_numpy()]
+    if state.kraj:
+        level = 'Trh_Kraj'
+        rows = rows[rows['Kraj'].isin(state.kraj).to_numpy()]
+    else:
+        level = 'Trh_Obor'
+        rows = rows.drop_duplicates('obor_id')
+    return _benchmark_result(*rows[[f'{level}_{col}' for col in BENCHMARK_SUMS]].to_numpy().sum(axis=0))
+
+
+def _benchmark_result(count, bm_capacity, bm_applicants, bm_accepted):
+    # Vážený průměr převisu (celkem přihlášky / celkem kapacita v benchmarku)
+    if count == 0:
+        return None
+    return {
+        'avg_previs': bm_applicants / bm_capacity if bm_capacity > 0 else 0,
+        'avg_uspesnost': bm_accepted / bm_applicants * 100 if bm_applicants > 0 else 0,
+    }
+
+
+def _scan_benchmark(tables, state, redizo):
+    df_final = final_table(tables, state)
+    school_obory = school_table(tables, state, redizo)['Obor'].unique()
+    df_benchmark = df_final[df_final['Obor'].isin(school_obory) & (df_final['REDIZO'] != redizo)]
+    return _benchmark_result(len(df_benchmark), *df_benchmark[['Kapacita', 'Prihlaseni', 'Prijati']].sum())
+
+
+# --- HEXBIN PRO STRATEGICKOU MATICI ---
+# Agregace bodů (škola x obor) do šestiúhelníkových košů na serveru: do prohlížeče
+# jde jen pár stovek košů místo tisíců bublin. Dvě posunuté mřížky, bod patří
+# ke středu, který je blíž (stejně jako matplotlib.hexbin).
+def hexbin(x, y, gridsize=30):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    xmin, xmax = x.min(), x.max()
+    ymin, ymax = y.min(), y.max()
+    ny = max(int(gridsize / np.sqrt(3)), 1)
+    sx = (xmax - xmin) / gridsize or 1.0
+    sy = (ymax - ymin) / ny or 1.0
+    ix, iy = (x - xmin) / sx, (y - ymin) / sy
+
+    ix1, iy1 = np.round(ix), np.round(iy)
+    ix2, iy2 = np.floor(ix), np.floor(iy)
+    d1 = (ix - ix1) ** 2 + 3 * (iy - iy1) ** 2
+    d2 = (ix - ix2 - 0.5) ** 2 + 3 * (iy - iy2 - 0.5) ** 2
+    first = d1 <= d2
+
+    cx = np.where(first, ix1, ix2 + 0.5)
+    cy = np.where(first, iy1, iy2 + 0.5)
+    # Středy z obou mřížek jsou v polovičních krocích -> celočíselný klíč koše
+    bin_key = (2 * cy).astype(np.int64) * (2 * gridsize + 4) + (2 * cx).astype(np.int64)
+    return bin_key, xmin + cx * sx, ymin + cy * sy
+
+
+def hexbin_table(df, gridsize):
+    # Koše pro tabulku se sloupci Previs_Poptavky / Uspesnost_Pct: 'bins' (střed, počet,
+    # součty, vážené metriky) a 'bin_id' = číslo koše pro každý řádek (pro drill-down na body)
+    bin_key, cx, cy = hexbin(df['Previs_Poptavky'], df['Uspesnost_Pct'], gridsize)
+    _, first, bin_id = np.unique(bin_key, return_index=True, return_inverse=True)
+
+    bins = pd.DataFrame({
+        'bin_id': np.arange(len(first)),
+        'x': cx[first],
+        'y': cy[first],
+        'Pocet': np.bincount(bin_id),
+    })
+    for col in ['Kapacita', 'Prihlaseni', 'Prijati']:
+        bins[col] = np.bincount(bin_id, weights=df[col].to_numpy()).astype(np.int64)
+    bins['Previs_Poptavky'] = bins['Prihlaseni'] / bins['Kapacita']
+    bins['Uspesnost_Pct'] = (bins['Prijati'] / bins['Prihlaseni'] * 100).fillna(0)
+    return {'bins': bins, 'bin_id': bin_id}
+
+
+@derived_cache.memoize
+def matrix_bins(tables, state, gridsize):
+    df_final = final_table(tables, state)
+    if df_final.empty:
+        return None
+    return hexbin_table(df_final, gridsize)
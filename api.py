@@ -0,0 +1,240 @@
+"""Lokální HTTP/JSON API nad stejnými tabulkami a agregacemi jako dashboard.
+
+Endpointy (GET), parametry filtrů jako v sidebaru; víc hodnot opakováním parametru
+(?kraj=Liberecký&kraj=Plzeňský):
+  /api/verze        verze dat, dostupné roky a kraje
+  /api/obory        škola x obor pro rok a filtry (df_final)        rok, kraj, mesto, obor, redizo
+  /api/zebricek     obory seřazené podle převisu (obory_table)      rok, kraj, mesto, obor, limit
+  /api/mezirocni    obory s největším nárůstem / poklesem přihlášek  rok, kraj, mesto, obor, n
+  /api/benchmark    škola vs. trh (detail školy a žebříček škol)    redizo (povinné), rok, kraj, mesto, obor
+Bez parametru rok se bere poslední rok v datech.
+
+Data se načtou jednou při startu stejně jako v report.py / app.py (úložiště, jinak CSV)
+a zůstávají v paměti jen pro čtení; ThreadingHTTPServer obsluhuje požadavky souběžně
+(vlákno na spojení, keep-alive). ETag je otisk verze dat, endpointu a normalizovaných
+parametrů, takže If-None-Match se vyřídí (304) bez výpočtu, a hotové JSON odpovědi
+drží response_cache (memo.LRUCache) se stejným klíčem. Výpočty jdou přes memoizované
+funkce analytics.py, sdílené s dashboardem v rámci procesu.
+
+Použití: python api.py [--host 127.0.0.1] [--port 8502] [--log]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+import analytics
+import memo
+import perf
+import report
+
+DEFAULT_PORT = 8502
+RESPONSE_MAX_ENTRIES = int(os.environ.get('JPZ_API_CACHE_MAX_ENTRIES', 512))
+FILTER_PARAMS = ['rok', 'kraj', 'mesto', 'obor', 'redizo']
+
+# Hotové odpovědi (bajty JSON); klíč = (endpoint, verze dat, parametry) jako u derived_cache
+response_cache = memo.LRUCache(max_entries=RESPONSE_MAX_ENTRIES)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def to_json(value):
+    # DataFrame -> záznamy přes pandas (NaN / inf -> null, numpy typy), zbytek přes json
+    if isinstance(value, pd.DataFrame):
+        return value.to_json(orient='records', force_ascii=False)
+    if isinstance(value, dict):
+        items = (f'{json.dumps(key, ensure_ascii=False)}: {to_json(item)}' for key, item in value.items())
+        return '{' + ', '.join(items) + '}'
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _ints(values, name):
+    try:
+        return [int(value) for value in values]
+    except ValueError:
+        raise ApiError(400, f"Parametr '{name}' musí být celé číslo") from None
+
+
+def parse_params(query):
+    # Query string -> normalizované parametry (hashovatelné, nezávislé na pořadí)
+    raw = parse_qs(query)
+    unknown = sorted(set(raw) - set(FILTER_PARAMS) - {'limit', 'n'})
+    if unknown:
+        raise ApiError(400, f"Neznámý parametr: {', '.join(unknown)}")
+    rok = _ints(raw.get('rok', []), 'rok')
+    if len(rok) > 1:
+        raise ApiError(400, "Parametr 'rok' může být jen jeden")
+    state = analytics.filter_state(rok[0] if rok else None, raw.get('kraj'), raw.get('mesto'), raw.get('obor'))
+    redizo = tuple(sorted(set(_ints(raw.get('redizo', []), 'redizo'))))
+    # Počet řádků (limit / n): kladné celé číslo; 0 a záporné hodnoty se odmítnou,
+    # jinak by head(0) / head(-k) vrátil celou tabulku, resp. tabulku bez posledních k řádků
+    name = 'n' if 'n' in raw else 'limit'
+    limit = _ints(raw.get('limit', []) + raw.get('n', []), name)
+    if len(limit) > 1:
+        raise ApiError(400, "Parametr 'limit' / 'n' může být jen jeden")
+    if limit and limit[0] < 1:
+        raise ApiError(400, f"Parametr '{name}' musí být alespoň 1")
+    return state, redizo, limit[0] if limit else None
+
+
+# --- ENDPOINTY ---
+# fn(tables, state, redizo, limit) -> dict / DataFrame; state má vždy vyplněný rok
+def version_info(tables, state, redizo, limit):
+    index = tables['filter_index']
+    return {'verze': tables['version'], 'roky': [int(r) for r in sorted(index.facet('Rok').index)],
+            'kraje': sorted(index.facet('Kraj').index.tolist()), 'endpointy': sorted(ENDPOINTS)}
+
+
+def programs(tables, state, redizo, limit):
+    df = analytics.final_table(tables, state)
+    if redizo:
+        df = df[df['REDIZO'].isin(redizo)]
+    return {'rok': state.rok, 'pocet': len(df), 'data': df}
+
+
+def ranking(tables, state, redizo, limit):
+    df = analytics.obory_table(tables, state).sort_values('Previs', ascending=False)
+    return {'rok': state.rok, 'data': df if limit is None else df.head(limit)}
+
+
+def movers(tables, state, redizo, limit):
+    deltas = analytics.yoy_tables(tables, state._replace(rok=None))
+    pair = analytics.yoy_pair(deltas, state.rok)
+    if pair is None:
+        raise ApiError(404, "Pro výběr nejsou data za dva po sobě jdoucí roky")
+    growers, losers = analytics.yoy_movers(deltas, pair, 5 if limit is None else limit)
+    return {'rok_od': int(pair[0]), 'rok_do': int(pair[1]),
+            'narust': growers.reset_index(), 'pokles': losers.reset_index()}
+
+
+def benchmark(tables, state, redizo, limit):
+    if len(redizo) != 1:
+        raise ApiError(400, "Parametr 'redizo' je povinný (jedna škola)")
+    redizo = redizo[0]
+    df_school = analytics.school_table(tables, state, redizo)
+    if df_school.empty:
+        raise ApiError(404, f"Škola {redizo} nemá ve výběru žádné obory")
+    capacity, applicants, accepted = (int(df_school[col].sum()) for col in ['Kapacita', 'Prihlaseni', 'Prijati'])
+    market = analytics.school_benchmark(tables, state, redizo)
+    schools = analytics.market_benchmark(tables, state.rok)['schools']
+    return {
+        'redizo': redizo,
+        'skola': tables['school_index'].label(redizo),
+        'rok': state.rok,
+        'skola_metriky': {
+            'kapacita': capacity, 'prihlaseni': applicants, 'prijati': accepted,
+            'previs': applicants / capacity if capacity > 0 else 0,
+            'uspesnost_pct': accepted / applicants * 100 if applicants > 0 else 0,
+        },
+        # Průměr konkurence ve stejných oborech (a kraji, pokud je vybrán); None = bez konkurence
+        'trh': None if market is None else {key: float(value) for key, value in market.items()},
+        'zebricek_skol': schools.loc[schools['REDIZO'] == redizo, analytics.BENCHMARK_DISPLAY_COLS],
+        'obory': df_school[['Obor', 'Kapacita', 'Prihlaseni', 'Meziroční změna', 'Prijati',
+                            'Previs_Poptavky', 'Uspesnost_Pct']],
+    }
+
+
+ENDPOINTS = {
+    '/api/verze': version_info,
+    '/api/obory': programs,
+    '/api/zebricek': ranking,
+    '/api/mezirocni': movers,
+    '/api/benchmark': benchmark,
+}
+
+
+def etag(tables, path, params):
+    digest = hashlib.sha1(repr((tables['version'], path, params)).encode('utf-8')).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+@response_cache.memoize
+def response(tables, path, params):
+    # Tělo odpovědi pro endpoint a normalizované parametry (bajty JSON)
+    state, redizo, limit = params
+    return to_json(ENDPOINTS[path](tables, state, redizo, limit)).encode('utf-8')
+
+
+# --- SERVER ---
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive: klient posílá další požadavky stejným spojením
+    server_version = 'jpz-api'
+    # Hlavička a tělo jdou zvlášť; bez TCP_NODELAY čeká malé tělo ~40 ms na ACK (Nagle)
+    disable_nagle_algorithm = True
+    tables = None
+    log_requests = False
+
+    def do_GET(self):
+        perf.start_run(kind='api')
+        with perf.stage(f'api:{urlsplit(self.path).path}'):
+            status, body, tag = self._handle()
+        perf.finish_run()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if tag:
+            self.send_header('ETag', tag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        # -> (status, tělo, ETag)
+        url = urlsplit(self.path)
+        if url.path not in ENDPOINTS:
+            return 404, to_json({'chyba': f"Neznámý endpoint {url.path}",
+                                 'endpointy': sorted(ENDPOINTS)}).encode('utf-8'), None
+        tables = self.tables
+        try:
+            state, redizo, limit = parse_params(url.query)
+            if state.rok is None:
+                state = state._replace(rok=int(tables['filter_index'].facet('Rok').index.max()))
+            params = (state, redizo, limit)
+            tag = etag(tables, url.path, params)
+            if tag in (value.strip() for value in self.headers.get('If-None-Match', '').split(',')):
+                return 304, b'', tag
+            return 200, response(tables, url.path, params), tag
+        except ApiError as e:
+            return e.status, to_json({'chyba': str(e)}).encode('utf-8'), None
+
+    def log_message(self, format, *args):
+        if self.log_requests:
+            super().log_message(format, *args)
+
+
+def serve(host='127.0.0.1', port=DEFAULT_PORT, log_requests=False):
+    t0 = time.perf_counter()
+    ApiHandler.tables = memo.freeze(report.load_tables())
+    ApiHandler.log_requests = log_requests
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    print(f"Data načtena za {(time.perf_counter() - t0) * 1000:.0f} ms (verze {ApiHandler.tables['version']}), "
+          f"API na http://{host}:{server.server_address[1]}/api/verze", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--log', action='store_true', help="vypisovat jednotlivé požadavky na stderr")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.log)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Zátěžový test lokálního JSON API (api.py): požadavky za sekundu a latence.
+
+Bez --url spustí api.py na volném portu jako podproces (a na konci ho ukončí).
+--concurrency vláken posílá po dobu --duration sekund požadavky přes vlastní
+keep-alive spojení, na střídačku ze směsi endpointů (obory, žebříček, meziroční
+změny, benchmark školy) pro všechny roky, bez filtru i po krajích. S --etag klient
+posílá If-None-Match s dříve vráceným ETagem (odpověď 304 bez těla), jinak vždy
+stahuje celé tělo. Vypíše počet požadavků, RPS a p50 / p95 / p99 latence celkem
+i po endpointech, s --out je uloží jako JSON.
+
+Klient i server běží v Pythonu (GIL): na jednom stroji jde o relativní srovnání
+verzí, ne o absolutní propustnost.
+
+Použití: python benchmarks/api_load.py [--url http://127.0.0.1:8502] [--concurrency 8]
+                                       [--duration 10] [--etag] [--out api.json]
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KRAJE_SAMPLE = 4
+SCHOOLS_SAMPLE = 20
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, timeout=120):
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, 'api.py'), '--port', str(port)],
+                            stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f"api.py skončil s kódem {proc.returncode}")
+        try:
+            get(('127.0.0.1', port), '/api/verze')
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    sys.exit("api.py se nespustil včas")
+
+
+def get(address, path):
+    conn = http.client.HTTPConnection(*address, timeout=60)
+    try:
+        conn.request('GET', path)
+        resp = conn.getresponse()
+        return json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+def request_mix(address):
+    # Seznam (endpoint, cesta): všechny roky, bez filtru a pro několik krajů, školy z výběru
+    info = get(address, '/api/verze')
+    paths = []
+    for rok in info['roky']:
+        for kraj in [None] + info['kraje'][:KRAJE_SAMPLE]:
+            params = {'rok': rok, **({'kraj': kraj} if kraj else {})}
+            for endpoint in ['/api/obory', '/api/zebricek', '/api/mezirocni']:
+                paths.append((endpoint, f'{endpoint}?{urlencode(params)}'))
+        schools = get(address, f"/api/obory?{urlencode({'rok': rok})}")['data'][::97][:SCHOOLS_SAMPLE]
+        for redizo in sorted({row['REDIZO'] for row in schools}):
+            paths.append(('/api/benchmark', f"/api/benchmark?{urlencode({'rok': rok, 'redizo': redizo})}"))
+    return paths
+
+
+def worker(address, paths, offset, deadline, use_etag, out):
+    conn = http.client.HTTPConnection(*address, timeout=60)
+    etags = {}
+    for endpoint, path in itertools.islice(itertools.cycle(paths), offset, None):
+        if time.perf_counter() >= deadline:
+            break
+        headers = {'If-None-Match': etags[path]} if use_etag and path in etags else {}
+        t0 = time.perf_counter()
+        conn.request('GET', path, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        out.append((endpoint, (time.perf_counter() - t0) * 1000, resp.status))
+        if resp.getheader('ETag'):
+            etags[path] = resp.getheader('ETag')
+    conn.close()
+
+
+def summarize(records, seconds):
+    ms = np.array([r[1] for r in records])
+    return {
+        'requests': len(records),
+        'rps': len(records) / seconds,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max()),
+    }
+
+
+def run(address, paths, concurrency, duration, use_etag):
+    results = [[] for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(address, paths, i * len(paths) // concurrency,
+                                                     deadline, use_etag, results[i]))
+               for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - t0
+    records = [r for part in results for r in part]
+    statuses = {}
+    for _, _, status in records:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'celkem': summarize(records, seconds),
+        'endpointy': {endpoint: summarize([r for r in records if r[0] == endpoint], seconds)
+                      for endpoint in sorted({r[0] for r in records})},
+        'statusy': statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="běžící API (jinak se spustí lokálně)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help="délka měření v sekundách")
+    parser.add_argument('--warmup', type=float, default=2.0, help="zahřátí cache před měřením (s)")
+    parser.add_argument('--etag', action='store_true', help="posílat If-None-Match (revalidace)")
+    parser.add_argument('--out', help="výsledky jako JSON")
+    args = parser.parse_args()
+
+    proc = None
+    if args.url:
+        url = urlsplit(args.url)
+        address = (url.hostname, url.port or 80)
+    else:
+        address = ('127.0.0.1', free_port())
+        proc = start_server(address[1])
+    try:
+        paths = request_mix(address)
+        if args.warmup:
+            run(address, paths, args.concurrency, args.warmup, False)
+        result = run(address, paths, args.concurrency, args.duration, args.etag)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    result['meta'] = {'cas': time.strftime('%Y-%m-%dT%H:%M:%S'), 'concurrency': args.concurrency,
+                      'duration_s': args.duration, 'etag': args.etag, 'cest': len(paths), 'cpu': os.cpu_count()}
+    print(f"{'endpoint':<18}{'požadavků':>10}{'RPS':>9}{'p50 [ms]':>10}{'p95 [ms]':>10}{'p99 [ms]':>10}")
+    for name, s in [*result['endpointy'].items(), ('celkem', result['celkem'])]:
+        print(f"{name:<18}{s['requests']:>10}{s['rps']:>9.0f}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}")
+    print(f"Statusy: {result['statusy']}")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
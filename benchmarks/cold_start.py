@@ -0,0 +1,56 @@
+"""Srovnání studeného startu etl.load_tables(): plné ETL z CSV vs. Parquet cache.
+
+Každé měření běží v novém procesu (jako restart kontejneru), aby se
+nepočítaly zahřáté importy ani cache v paměti.
+
+Použití: python benchmarks/cold_start.py [--runs 5] [--csv data.csv]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import time
+import etl
+t0 = time.perf_counter()
+tables = etl.load_tables({csv!r}, use_cache={use_cache})
+print((time.perf_counter() - t0) * 1000)
+"""
+
+
+def measure(csv_path, use_cache):
+    out = subprocess.run(
+        [sys.executable, '-c', SNIPPET.format(csv=csv_path, use_cache=use_cache)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'data.csv'))
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import etl
+
+    # Zahřátí cache (první běh ji vytvoří)
+    etl.clear_cache(args.csv)
+    measure(args.csv, True)
+
+    etl_ms = [measure(args.csv, False) for _ in range(args.runs)]
+    cache_ms = [measure(args.csv, True) for _ in range(args.runs)]
+
+    print(f"{'Režim':<22}{'medián [ms]':>12}{'min [ms]':>10}")
+    print(f"{'CSV + ETL':<22}{statistics.median(etl_ms):>12.1f}{min(etl_ms):>10.1f}")
+    print(f"{'Parquet cache':<22}{statistics.median(cache_ms):>12.1f}{min(cache_ms):>10.1f}")
+    print(f"Zrychlení: {statistics.median(etl_ms) / statistics.median(cache_ms):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Rychlost filtrování kostky: maskování přes dimenze vs. invertovaný index.
+
+Kostka se pro simulaci větších dat N-krát zopakuje (stejné klíče, víc řádků).
+
+Použití: python benchmarks/filter_index.py [--scale 100] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analytics  # noqa: E402
+import etl  # noqa: E402
+import filter_index  # noqa: E402
+
+CASES = {
+    'rok': dict(rok=2025),
+    'rok + kraj': dict(rok=2025, kraj=['Hlavní město Praha']),
+    'rok + 2 kraje + obor': dict(rok=2024, kraj=['Jihomoravský', 'Zlínský'], obor=['Gymnázium']),
+    'rok + město': dict(rok=2025, mesto=['Brno']),
+    'škola (detail)': dict(rok=2025, skola=['Gymnázium']),
+}
+
+
+def best_ms(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    tables = etl.load_tables(os.path.join(ROOT, etl.CSV_PATH))
+    tables['cube'] = pd.concat([tables['cube']] * args.scale, ignore_index=True)
+
+    t0 = time.perf_counter()
+    index = filter_index.FilterIndex.from_tables(tables)
+    print(f"Kostka: {len(tables['cube'])} řádků, stavba indexu {(time.perf_counter() - t0) * 1000:.0f} ms")
+    indexed = dict(tables, filter_index=index)
+
+    print(f"{'Filtr':<24}{'řádků':>10}{'maska [ms]':>12}{'index [ms]':>12}{'jen pozice [ms]':>17}")
+    for name, filters in CASES.items():
+        n = len(analytics.slice_cube(indexed, valid_only=False, **filters))
+        mask_ms = best_ms(lambda: analytics.slice_cube(tables, valid_only=False, **filters), args.repeat)
+        index_ms = best_ms(lambda: analytics.slice_cube(indexed, valid_only=False, **filters), args.repeat)
+        pos_ms = best_ms(lambda: index.positions(Rok=filters.get('rok'), Kraj=filters.get('kraj'), Město=filters.get('mesto'),
+                                                 Obor=filters.get('obor'), Škola=filters.get('skola')), args.repeat)
+        print(f"{name:<24}{n:>10}{mask_ms:>12.2f}{index_ms:>12.2f}{pos_ms:>17.3f}")
+
+
+if __name__ == '__main__':
+    main()
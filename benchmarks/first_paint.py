@@ -0,0 +1,78 @@
+"""Čas a objem prvního vykreslení stránky "Celkový přehled trhu".
+
+"Před" = všechny sekce přehledu se spočítají a odešlou najednou (matice, priority,
+důvody nepřijetí, obory, meziroční srovnání). "Po" = views.render_overview, kde se
+spustí jen otevřená (výchozí) záložka. Před každým během se vyprázdní sdílené
+memoizace tabulek i grafů, takže se měří studený výpočet pro daný filtr.
+
+Použití: python benchmarks/first_paint.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import analytics  # noqa: E402
+import etl  # noqa: E402
+import memo  # noqa: E402
+
+
+def eager_overview(tables, filter_state, df_final):
+    import views
+    views.strategy_matrix(tables, filter_state, df_final)
+    views.priority_sections(tables, filter_state, df_final)
+    views.obory_section(tables, filter_state)
+    views.yoy_section(tables, filter_state)
+
+
+def lazy_overview(tables, filter_state, df_final):
+    import views
+    views.render_overview(tables, filter_state, df_final)
+
+
+def payload_bytes(at):
+    # Velikost serializovaných grafů a tabulek, které jdou do prohlížeče
+    elements = list(at.get('plotly_chart')) + list(at.dataframe)
+    return sum(el.proto.ByteSize() for el in elements)
+
+
+def measure(script, kwargs, runs):
+    times, size, charts = [], 0, 0
+    for _ in range(runs):
+        memo.derived_cache.clear()
+        memo.figure_cache.clear()
+        at = AppTest.from_function(script, kwargs=kwargs, default_timeout=120)
+        t0 = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - t0) * 1000)
+        assert not at.exception, at.exception
+        size, charts = payload_bytes(at), len(at.get('plotly_chart'))
+    return statistics.median(times), size, charts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    tables = etl.load_tables()
+    state = analytics.filter_state(max(tables['cube']['Rok']))
+    df_final = analytics.final_table(tables, state)
+    kwargs = dict(tables=tables, filter_state=state, df_final=df_final)
+
+    print(f"{'Varianta':<28}{'čas [ms]':>10}{'grafů':>7}{'payload [kB]':>14}")
+    for label, script in [("všechny sekce najednou", eager_overview),
+                          ("jen otevřená záložka", lazy_overview)]:
+        ms, size, charts = measure(script, kwargs, args.runs)
+        print(f"{label:<28}{ms:>10.1f}{charts:>7}{size / 1024:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
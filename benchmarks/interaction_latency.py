@@ -0,0 +1,100 @@
+"""Latence jedné interakce: celý rerun skriptu vs. rerun jen dotčeného fragmentu.
+
+"Před" = AppTest spustí celý app.py po změně widgetu (tak se chovala aplikace bez
+fragmentů). "Po" = AppTest spustí jen tělo fragmentu se stejnými vstupy, což je práce,
+kterou Streamlit při změně widgetu uvnitř st.fragment skutečně udělá.
+
+Použití: python benchmarks/interaction_latency.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import analytics  # noqa: E402
+import etl  # noqa: E402
+import filter_index  # noqa: E402
+import school_index  # noqa: E402
+import views  # noqa: E402
+
+OVERVIEW, DETAIL = "Celkový přehled trhu", "Detail školy"
+
+
+def fragment_script(name, kwargs):
+    import views
+    getattr(views, name)(**kwargs)
+
+
+def timed_run(at):
+    t0 = time.perf_counter()
+    at.run()
+    assert not at.exception, at.exception
+    return (time.perf_counter() - t0) * 1000
+
+
+def full_rerun_ms(page, section, interact, runs):
+    at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=120)
+    at.run()
+    at.sidebar.radio[0].set_value(page)
+    at.run()
+    times = []
+    for i in range(runs):
+        # Záložka přehledu se drží přes session state (AppTest jinak posílá výchozí)
+        if section:
+            at.session_state['overview_section'] = section
+            at.run()
+        interact(at, i)
+        if section:
+            at.session_state['overview_section'] = section
+        times.append(timed_run(at))
+    return times
+
+
+def fragment_ms(name, kwargs, runs):
+    at = AppTest.from_function(fragment_script, args=(name, kwargs), default_timeout=120)
+    at.run()
+    return [timed_run(at) for _ in range(runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    tables = etl.load_tables()
+    tables['filter_index'] = filter_index.FilterIndex.from_tables(tables)
+    tables['school_index'] = school_index.SchoolIndex.from_tables(tables)
+    state = analytics.filter_state(max(tables['cube']['Rok']))
+    df_final = analytics.final_table(tables, state)
+    df_priorities = df_final.sort_values('Prihlaseni', ascending=False).head(10)
+    schools = analytics.school_options(tables, state)[:2]
+
+    priority_tab = views.OVERVIEW_SECTIONS[1]
+    cases = [
+        ("Zobrazit jako % (důvody nepřijetí)",
+         OVERVIEW, priority_tab, lambda at, i: at.checkbox[0].set_value(i % 2 == 0),
+         'rejection_chart', dict(tables=tables, filter_state=state, selected_schools=())),
+        ("Výběr škol pro srovnání priorit",
+         OVERVIEW, priority_tab, lambda at, i: at.multiselect[0].set_value(list(df_priorities['Skola_Obor'][:1 + i % 3])),
+         'priority_sections', dict(tables=tables, filter_state=state, df_final=df_final)),
+        ("Výběr školy (Detail školy)",
+         DETAIL, None, lambda at, i: at.selectbox[0].set_value(schools[i % 2]),
+         'school_detail', dict(tables=tables, filter_state=state, df_final=df_final)),
+    ]
+
+    print(f"{'Interakce':<38}{'celý rerun [ms]':>17}{'fragment [ms]':>15}{'zrychlení':>11}")
+    for label, page, section, interact, fragment, kwargs in cases:
+        before = statistics.median(full_rerun_ms(page, section, interact, args.runs))
+        after = statistics.median(fragment_ms(fragment, kwargs, args.runs))
+        print(f"{label:<38}{before:>17.1f}{after:>15.1f}{before / after:>10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
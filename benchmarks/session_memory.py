@@ -0,0 +1,84 @@
+"""Paměť procesu (RSS) při N souběžných sessions dashboardu.
+
+V jednom procesu (jako jeden Streamlit server) se postupně otevře N sessions
+přes AppTest a všechny zůstanou naživu: každá vybere jiný kraj a přepne na
+"Detail školy" (fragmenty si drží své argumenty, tedy i načtená data).
+Varianta "cache_resource" je app.py tak, jak je (data sdílená, jen pro čtení),
+"cache_data" je stejný skript s @st.cache_data (kopie dat pro každou session).
+Každá varianta běží v samostatném procesu; vypisuje se RSS po daném počtu
+sessions a nárůst na jednu session.
+
+Použití: python benchmarks/session_memory.py [--sessions 1 5 10 20]
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VARIANTS = ['cache_resource', 'cache_data']
+
+
+def rss_mb():
+    # Aktuální RSS z /proc (Linux)
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def child(variant, checkpoints):
+    from streamlit.testing.v1 import AppTest
+    os.chdir(ROOT)
+    with open(os.path.join(ROOT, 'app.py'), encoding='utf-8') as f:
+        script = f.read()
+    if variant == 'cache_data':
+        script = script.replace('@st.cache_resource', '@st.cache_data')
+
+    sessions, out = [], {}
+    kraje = None
+    for n in range(1, max(checkpoints) + 1):
+        at = AppTest.from_string(script, default_timeout=120)
+        at.run()
+        kraje = kraje or at.sidebar.multiselect[0].options
+        at.sidebar.multiselect[0].set_value([kraje[n % len(kraje)]]).run()
+        at.sidebar.radio[0].set_value("Detail školy").run()
+        assert not at.exception, at.exception
+        sessions.append(at)
+        if n in checkpoints:
+            gc.collect()
+            out[n] = rss_mb()
+    print(json.dumps(out))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10, 20])
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, set(args.sessions))
+        return
+
+    results = {}
+    for variant in VARIANTS:
+        out = subprocess.run([sys.executable, __file__, '--child', variant, '--sessions', *map(str, args.sessions)],
+                             check=True, capture_output=True, text=True).stdout
+        results[variant] = {int(k): v for k, v in json.loads(out.strip().splitlines()[-1]).items()}
+
+    first, last = min(args.sessions), max(args.sessions)
+    print(f"{'sessions':>9}" + ''.join(f"{v + ' [MB]':>22}" for v in VARIANTS))
+    for n in sorted(args.sessions):
+        print(f"{n:>9}" + ''.join(f"{results[v][n]:>22.0f}" for v in VARIANTS))
+    if last > first:
+        print(f"{'MB/session':>9}" + ''.join(
+            f"{(results[v][last] - results[v][first]) / (last - first):>22.2f}" for v in VARIANTS))
+
+
+if __name__ == '__main__':
+    main()
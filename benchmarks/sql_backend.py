@@ -0,0 +1,104 @@
+"""Kontrola shody a rychlosti SQL backendu (DuckDB) proti pandas.
+
+Pro sadu stavů filtrů (bez filtru, kraje, více krajů, město, obor, každý rok)
+spočítá df_final, souhrn po oborech, meziroční tabulku a benchmark vybraných škol
+oběma backendy, porovná výsledky (pandas.testing, relativní tolerance 1e-9)
+a vypíše medián času. Při neshodě skončí s chybou.
+
+Použití: python benchmarks/sql_backend.py [--schools 20] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analytics  # noqa: E402
+import filter_index  # noqa: E402
+import school_index  # noqa: E402
+import sql_backend  # noqa: E402
+import store  # noqa: E402
+
+
+def run(backend, fn, *args):
+    sql_backend.BACKEND = backend
+    return fn.uncached(*args)
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def same(a, b, sort_by=None):
+    if isinstance(a, pd.DataFrame):
+        if sort_by:
+            a = a.astype({col: str for col in sort_by}).sort_values(sort_by)
+            b = b.astype({col: str for col in sort_by}).sort_values(sort_by)
+        pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True),
+                                      check_dtype=False, check_categorical=False, rtol=1e-9)
+    elif a is None or b is None:
+        assert a is b, (a, b)
+    else:
+        assert a.keys() == b.keys() and all(abs(a[k] - b[k]) <= 1e-9 * max(1, abs(a[k])) for k in a), (a, b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--schools', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+    if sql_backend.duckdb is None:
+        sys.exit("duckdb není nainstalované (pip install duckdb)")
+
+    store.open_store()
+    tables = store.load_tables()
+    tables['filter_index'] = filter_index.FilterIndex.from_tables(tables)
+    tables['school_index'] = school_index.SchoolIndex.from_tables(tables)
+    index = tables['filter_index']
+    kraje = sorted(index.facet('Kraj').index)
+    praha = 'Hlavní město Praha'
+    states = []
+    for rok in sorted(index.facet('Rok').index):
+        states += [analytics.filter_state(rok), analytics.filter_state(rok, [praha]),
+                   analytics.filter_state(rok, kraje[:3]), analytics.filter_state(rok, [praha], ['Praha']),
+                   analytics.filter_state(rok, obor=['Gymnázium', 'Informační technologie'])]
+
+    checks = {'final_table': 0, 'obory_table': 0, 'yoy_tables': 0, 'school_benchmark': 0}
+    times = {name: {'pandas': [], 'duckdb': []} for name in checks}
+    for state in states:
+        cases = [('final_table', analytics.final_table, (tables, state), None),
+                 ('obory_table', analytics.obory_table, (tables, state), None),
+                 ('yoy_tables', analytics.yoy_tables, (tables, state._replace(rok=None)), ['Rok_Do', 'Obor'])]
+        schools = analytics.final_table.uncached(tables, state)['REDIZO'].unique()[:args.schools]
+        cases += [('school_benchmark', analytics.school_benchmark, (tables, state, int(redizo)), None)
+                  for redizo in schools]
+        for name, fn, fn_args, sort_by in cases:
+            expected, actual = run('pandas', fn, *fn_args), run('duckdb', fn, *fn_args)
+            try:
+                same(expected, actual, sort_by)
+            except AssertionError as e:
+                sys.exit(f"NESHODA {name} {fn_args[1:]}:\n{e}")
+            checks[name] += 1
+            for backend in ['pandas', 'duckdb']:
+                times[name][backend].append(timed(lambda: run(backend, fn, *fn_args), args.runs))
+
+    print(f"Stavů filtrů: {len(states)}, vše se shoduje.")
+    print(f"{'dotaz':<18}{'kontrol':>8}{'pandas [ms]':>13}{'duckdb [ms]':>13}")
+    for name, n in checks.items():
+        print(f"{name:<18}{n:>8}{statistics.median(times[name]['pandas']):>13.2f}"
+              f"{statistics.median(times[name]['duckdb']):>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
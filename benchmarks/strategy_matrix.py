@@ -0,0 +1,77 @@
+"""Velikost a cena sestavení grafu strategické matice podle režimu vykreslení.
+
+Pro df_final (nejnovější rok, bez filtrů) zvětšený N-krát (kopie řádků s malým
+šumem v metrikách) sestaví graf v režimech SVG, WebGL a hexbin a změří čas
+sestavení + serializace do JSON a velikost JSON, který jde do prohlížeče.
+
+Použití: python benchmarks/strategy_matrix.py [--scales 1 10 100] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import plotly.express as px
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analytics  # noqa: E402
+import etl  # noqa: E402
+import charts  # noqa: E402
+
+
+def scaled(df_final, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    df = df_final.loc[df_final.index.repeat(scale)].reset_index(drop=True)
+    if scale > 1:
+        df['Previs_Poptavky'] = (df['Previs_Poptavky'] * rng.normal(1, 0.05, len(df))).clip(lower=0)
+        df['Uspesnost_Pct'] = (df['Uspesnost_Pct'] + rng.normal(0, 2, len(df))).clip(0, 100)
+    return df
+
+
+def scatter_json(df, render_mode):
+    fig = px.scatter(df, x="Previs_Poptavky", y="Uspesnost_Pct", size="Kapacita", color="Zřizovatel",
+                     hover_name="Skola_Obor", hover_data={"Kapacita": True, "Prihlaseni": True, "Prijati": True},
+                     render_mode=render_mode)
+    return charts.add_quadrant_guides(fig).to_json()
+
+
+def hexbin_json(df):
+    bins = analytics.hexbin_table(df, charts.HEXBIN_GRIDSIZE)['bins']
+    return charts.hexbin_figure(bins, "").to_json()
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), len(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    tables = etl.load_tables(os.path.join(ROOT, etl.CSV_PATH))
+    df_final = analytics.final_table(tables, analytics.filter_state(max(tables['cube']['Rok'])))
+
+    print(f"{'body':>9}  {'režim':<8}{'sestavení + JSON [ms]':>23}{'JSON [kB]':>12}")
+    for scale in args.scales:
+        df = scaled(df_final, scale)
+        modes = [('svg', lambda: scatter_json(df, 'svg')),
+                 ('webgl', lambda: scatter_json(df, 'webgl')),
+                 ('hexbin', lambda: hexbin_json(df))]
+        for mode, fn in modes:
+            ms, size = timed(fn, args.runs)
+            print(f"{len(df):>9}  {mode:<8}{ms:>23.1f}{size / 1024:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
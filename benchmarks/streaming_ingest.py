@@ -0,0 +1,81 @@
+"""Špičková paměť a čas importu zdrojového CSV: celé najednou vs. po blocích.
+
+Zdroj je data.csv zopakovaný N-krát (stejné jednotky, víc řádků -> model exportu
+po uchazečích). "Najednou" = pd.read_csv celého souboru + clean_data, "po blocích"
+= etl.stream_source (validace + průběžná redukce na součty). Každé měření běží
+v samostatném procesu, paměť je maximální RSS procesu (včetně importu knihoven,
+ten ukazuje řádek "jen import").
+
+Použití: python benchmarks/streaming_ingest.py [--scales 1 10 50] [--chunksize 20000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+import etl  # noqa: E402
+
+
+def child(mode, path, chunksize):
+    t0 = time.perf_counter()
+    rows = 0
+    if mode == 'najednou':
+        rows = len(etl.clean_data(pd.read_csv(path)))
+    elif mode == 'po blocích':
+        rows = len(etl.stream_source(path, chunksize=chunksize)[0])
+    ms = (time.perf_counter() - t0) * 1000
+    # ru_maxrss je na Linuxu v kB
+    print(json.dumps({'ms': ms, 'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 'rows': rows}))
+
+
+def measure(mode, path, chunksize):
+    out = subprocess.run([sys.executable, __file__, '--child', mode, path, '--chunksize', str(chunksize)],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def write_scaled(src, dst, scale):
+    # Hlavička jednou, tělo souboru N-krát
+    with open(src, encoding='utf-8') as f:
+        header, body = f.readline(), f.read()
+    with open(dst, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for _ in range(scale):
+            f.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--chunksize', type=int, default=etl.CHUNK_ROWS)
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child, args.chunksize)
+        return
+
+    src = os.path.join(ROOT, 'data.csv')
+    print(f"{'N':>4}{'CSV [MB]':>10}  {'varianta':<12}{'čas [ms]':>10}{'max RSS [MB]':>14}{'řádků výstupu':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        base = measure('import', src, args.chunksize)
+        print(f"{'':>4}{'':>10}  {'jen import':<12}{'':>10}{base['rss_mb']:>14.0f}")
+        for scale in args.scales:
+            path = os.path.join(tmp, f"data_x{scale}.csv")
+            write_scaled(src, path, scale)
+            size = os.path.getsize(path) / 2**20
+            for mode in ['najednou', 'po blocích']:
+                r = measure(mode, path, args.chunksize)
+                print(f"{scale:>4}{size:>10.1f}  {mode:<12}{r['ms']:>10.0f}{r['rss_mb']:>14.0f}{r['rows']:>15}")
+
+
+if __name__ == '__main__':
+    main()
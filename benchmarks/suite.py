@@ -0,0 +1,251 @@
+"""Sada výkonnostních benchmarků horkých cest dashboardu nad syntetickými daty.
+
+Pro každé měřítko (1x, 10x, 100x řádků data.csv, viz benchmarks/synthetic.py) se
+vygeneruje zdrojový CSV a v samostatném procesu se změří:
+  * load_data          načtení jako v app.py (ETL z CSV / Parquet cache + indexy + freeze),
+  * sidebar            počty ve filtrech (facety jako v sekci 2 app.py),
+  * final_table        agregace a merge popisků pro df_final (sekce 3),
+  * obory_table        souhrn po oborech,
+  * yoy_tables         meziroční tabulky po oborech,
+  * school_table / school_benchmark   stránka "Detail školy",
+  * comparables        stavba indexu srovnatelných oborů a dotaz na k nejbližších,
+  * figure / figure_json   stavba Plotly figur a jejich serializace do JSON,
+pro stavy filtrů bez filtru, jeden kraj a kraj + město. Tabulky se měří "za studena"
+(memo cache vyprázdněná před každým během), figury nad zahřátými tabulkami.
+
+Výsledky (medián a minimum v ms, počty řádků, max RSS) se uloží jako JSON do
+benchmarks/results/; s --compare se porovnají s dřívějším během a zpomalení nad
+--threshold se vypíše a skript skončí s chybou (kontrola regresí).
+
+Použití: python benchmarks/suite.py [--scales 1 10 100] [--runs 5] [--compare results/starší.json]
+         python benchmarks/suite.py --compare <starší.json> <novější.json>   (jen porovnání)
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import plotly.io as pio  # noqa: E402
+
+import analytics  # noqa: E402
+import charts  # noqa: E402
+import comparables  # noqa: E402
+import etl  # noqa: E402
+import filter_index  # noqa: E402
+import memo  # noqa: E402
+import school_index  # noqa: E402
+import synthetic  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+PRAHA = 'Hlavní město Praha'
+
+
+def timed(fn, runs, before=None):
+    # before() se volá před každým během a do času se nepočítá (vyprázdnění cache)
+    times = []
+    for _ in range(runs):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return {'median_ms': statistics.median(times), 'min_ms': min(times), 'runs': runs}
+
+
+def clear_all():
+    memo.derived_cache.clear()
+    memo.figure_cache.clear()
+
+
+def load_data(csv_path, use_cache):
+    # Stejná práce jako app.load_data (bez úložiště)
+    tables = etl.load_tables(csv_path, use_cache=use_cache)
+    tables['filter_index'] = filter_index.FilterIndex.from_tables(tables)
+    tables['school_index'] = school_index.SchoolIndex.from_tables(tables)
+    tables['comparable_index'] = comparables.ComparableIndex.from_tables(tables)
+    return memo.freeze(tables)
+
+
+def sidebar(tables, state):
+    # Sekce 2 app.py: seznamy hodnot a počty v závorkách
+    index = tables['filter_index']
+    kraj = list(state.kraj)
+    index.facet('Kraj', Rok=state.rok)
+    index.facet('Kraj')
+    index.facet('Město', Kraj=kraj)
+    index.facet('Město', Rok=state.rok, Kraj=kraj)
+    index.facet('Obor', Rok=state.rok, Kraj=kraj, Město=list(state.mesto))
+    index.facet('Obor')
+
+
+def figures(tables, state, redizo):
+    # Builder grafu -> argumenty (jako ve views.py)
+    rok = state.rok
+    return {
+        'matrix_scatter': (charts.matrix_scatter, (tables, state)),
+        'matrix_hexbin': (charts.matrix_hexbin, (tables, state)),
+        'priority': (charts.priority_figure, (tables, state, ())),
+        'rejection': (charts.rejection_figure, (tables, state, (), False)),
+        'obory': (charts.obory_figure, (tables, state)),
+        'dumbbell': (charts.dumbbell_figure, (tables, state._replace(rok=None), rok)),
+        'school_priority': (charts.school_priority_figure, (tables, state, redizo)),
+        'school_reject': (charts.school_reject_figure, (tables, state, redizo)),
+    }
+
+
+def child(csv_path, runs):
+    # Plné ETL (a zápis Parquet cache) jen jednou, u 100x trvá desítky sekund
+    etl.clear_cache(csv_path)
+    results = {'load_data[etl]': timed(lambda: load_data(csv_path, use_cache=True), 1)}
+    results['load_data[cache]'] = timed(lambda: load_data(csv_path, use_cache=True), runs)
+    tables = load_data(csv_path, use_cache=True)
+
+    rok = int(tables['cube']['Rok'].max())
+    states = {
+        'vse': analytics.filter_state(rok),
+        'kraj': analytics.filter_state(rok, [PRAHA]),
+        'mesto': analytics.filter_state(rok, [PRAHA], ['Praha']),
+    }
+    # Škola pro detail: nejvíc přihlášek v Praze
+    df_praha = analytics.final_table(tables, states['kraj'])
+    redizo = int(df_praha.groupby('REDIZO')['Prihlaseni'].sum().idxmax())
+
+    index = tables['comparable_index']
+    unit_id = int(df_praha.loc[df_praha['REDIZO'] == redizo, 'unit_id'].iat[0])
+    results['comparables[build]'] = timed(lambda: comparables.ComparableIndex.from_tables(tables), runs)
+    results['comparables[obor]'] = timed(lambda: index.neighbours(unit_id, rok), runs)
+    results['comparables[vse]'] = timed(lambda: index.neighbours(unit_id, rok, same_obor=False), runs)
+
+    for name, state in states.items():
+        results[f'sidebar[{name}]'] = timed(lambda: sidebar(tables, state), runs)
+        for fn, args in [(analytics.final_table, (tables, state)),
+                         (analytics.obory_table, (tables, state)),
+                         (analytics.yoy_tables, (tables, state._replace(rok=None))),
+                         (analytics.school_benchmark, (tables, state, redizo))]:
+            results[f'{fn.__name__}[{name}]'] = timed(lambda: fn(*args), runs, before=clear_all)
+        results[f'school_table[{name}]'] = timed(lambda: analytics.school_table(tables, state, redizo), runs)
+
+        for chart, (fn, args) in figures(tables, state, redizo).items():
+            fig = fn(*args)  # zahřátí tabulek, pod kterými graf stojí
+            results[f'figure[{chart}][{name}]'] = timed(lambda: fn(*args), runs, before=memo.figure_cache.clear)
+            if fig is not None:
+                results[f'figure_json[{chart}][{name}]'] = timed(lambda: pio.to_json(fig), runs)
+
+    cube = tables['cube']
+    print(json.dumps({
+        'rows_cube': len(cube),
+        'rows_final': len(analytics.final_table(tables, states['vse'])),
+        'schools': len(tables['dim_school']),
+        'years': sorted(int(r) for r in cube['Rok'].unique()),
+        # ru_maxrss je na Linuxu v kB
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'stages': results,
+    }))
+
+
+def run_scale(csv_path, runs):
+    out = subprocess.run([sys.executable, __file__, '--child', csv_path, '--runs', str(runs)],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new, threshold, min_ms):
+    # Vypíše časy obou běhů pro společná měřítka a etapy; vrací seznam regresí.
+    # Etapy pod jednotky ms šumí, za regresi se počítá jen zpomalení aspoň o min_ms.
+    regressions = []
+    print(f"{'měřítko':>8}  {'etapa':<42}{'před [ms]':>11}{'po [ms]':>11}{'poměr':>8}")
+    for scale in sorted(set(old['scales']) & set(new['scales']), key=int):
+        before, after = old['scales'][scale]['stages'], new['scales'][scale]['stages']
+        for stage in sorted(set(before) & set(after)):
+            a, b = before[stage]['median_ms'], after[stage]['median_ms']
+            ratio = b / a if a > 0 else float('inf')
+            flag = ''
+            if ratio > threshold and b - a >= min_ms:
+                regressions.append((scale, stage, ratio))
+                flag = '  !'
+            print(f"{scale + 'x':>8}  {stage:<42}{a:>11.2f}{b:>11.2f}{ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="výstupní JSON (výchozí benchmarks/results/suite-<čas>.json)")
+    parser.add_argument('--data-dir', help="adresář pro vygenerovaná data (existující soubory se použijí znovu)")
+    parser.add_argument('--compare', nargs='+', metavar='JSON',
+                        help="dřívější výsledky; se dvěma soubory jen porovná bez měření")
+    parser.add_argument('--threshold', type=float, default=1.25, help="poměr časů považovaný za regresi")
+    parser.add_argument('--min-ms', type=float, default=1.0, help="minimální zpomalení v ms pro regresi")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.runs)
+        return
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0], encoding='utf-8') as f_old, open(args.compare[1], encoding='utf-8') as f_new:
+            regressions = compare(json.load(f_old), json.load(f_new), args.threshold, args.min_ms)
+        sys.exit(f"Regrese: {len(regressions)}" if regressions else 0)
+
+    result = {
+        'meta': {
+            'cas': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platforma': platform.platform(),
+            'cpu': os.cpu_count(),
+            'runs': args.runs,
+            'seed': args.seed,
+        },
+        'scales': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        for scale in args.scales:
+            path = os.path.join(data_dir, f"synthetic_x{scale}_seed{args.seed}.csv")
+            if not os.path.exists(path):
+                synthetic.generate(path, scale, args.seed)
+            r = run_scale(path, args.runs)
+            with open(path, encoding='utf-8') as f:
+                r['rows_source'] = sum(1 for _ in f) - 1
+            result['scales'][str(scale)] = r
+            print(f"{scale:>4}x  {r['rows_source']:>9} řádků CSV, {r['rows_cube']:>8} řádků kostky, "
+                  f"max RSS {r['rss_mb']:.0f} MB")
+            for stage, t in r['stages'].items():
+                print(f"      {stage:<42}{t['median_ms']:>11.2f} ms")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"suite-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"Výsledky: {out}")
+
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as f:
+            regressions = compare(json.load(f), result, args.threshold, args.min_ms)
+        if regressions:
+            sys.exit(f"Regrese: {len(regressions)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Generátor syntetických dat ve tvaru data.csv v N-násobné velikosti.
+
+Základem je data.csv (měřítko 1 = beze změny). Větší měřítka přidají
+  * další roky: poslední rok (obě kola) posunutý o 1, 2... let dopředu,
+    počet přidaných let = log10(N) (10x -> +1 rok, 100x -> +2 roky),
+  * další školy: kopie všech škol s novým REDIZO (800 000 000 + kopie * 10 000 + pořadí,
+    mimo rozsah skutečných REDIZO) a názvem s příponou " [S<kopie>]",
+tolik kopií, aby řádků bylo přibližně N x 14,5 tis. Počty v kopiích a nových letech
+jsou náhodně přeškálované (jeden faktor na řádek pro přihlášky / přijetí / důvody,
+zvlášť pro kapacitu) a zaokrouhlené dolů, takže platí stejná pravidla jako u exportu
+(přijatí <= přihlášení, součet priorit <= celkem). Výstup je deterministický (--seed)
+a zapisuje se po kopiích, bez držení celého souboru v paměti.
+
+Použití: python benchmarks/synthetic.py <výstup.csv> [--scale 10] [--seed 0]
+"""
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import etl  # noqa: E402
+
+SOURCE = os.path.join(ROOT, 'data.csv')
+SYNTHETIC_REDIZO = 800_000_000
+SCHOOLS_PER_COPY = 10_000
+# Rozptyl náhodného faktoru počtů (lognormální, medián 1)
+NOISE_SIGMA = 0.15
+
+# Názvy sloupců ve zdrojovém exportu (před přejmenováním v etl.py)
+RAW = {name: raw for raw, name in etl.COL_MAP.items()}
+COUNT_RAW = [RAW[name] for name in etl.COUNT_COLS if name != 'Kapacita']
+
+
+def extra_years(scale):
+    return int(math.log10(scale)) if scale >= 10 else 0
+
+
+def plan(source, scale):
+    # (počet kopií škol, přidané roky) tak, aby řádků bylo zhruba scale x zdroj
+    years = sorted(source['Rok'].unique())
+    added = [years[-1] + i for i in range(1, extra_years(scale) + 1)]
+    rows_per_copy = len(source) + len(added) * (source['Rok'] == years[-1]).sum()
+    copies = max(1, round(scale * len(source) / rows_per_copy))
+    return copies, added
+
+
+def perturb(df, rng):
+    # Faktor po řádcích + zaokrouhlení dolů: floor(f*a) <= floor(f*b) pro a <= b
+    # a součet floor(f*a_i) <= floor(f*součet) -> pravidla validace zůstanou splněná
+    df = df.copy()
+    factor = rng.lognormal(0, NOISE_SIGMA, len(df))
+    counts = df[COUNT_RAW].to_numpy(dtype='float64')
+    df[COUNT_RAW] = np.floor(counts * factor[:, None]).astype('int64')
+    capacity = df[RAW['Kapacita']].to_numpy(dtype='float64')
+    df[RAW['Kapacita']] = np.floor(capacity * rng.lognormal(0, NOISE_SIGMA, len(df))).astype('int64')
+    return df
+
+
+def generate(path, scale, seed=0, source_path=SOURCE):
+    # Zapíše syntetický CSV do `path`; vrací počet řádků
+    source = pd.read_csv(source_path)
+    copies, added = plan(source, scale)
+    latest = source[source['Rok'] == source['Rok'].max()]
+    # Pořadí školy podle normalizovaného REDIZO (sečtené hodnoty z kontingenční tabulky
+    # patří jedné škole) -> nové REDIZO kopie
+    redizo = etl.normalize_redizo(source[RAW['REDIZO']])
+    rank = pd.Series(np.arange(redizo.nunique()), index=np.sort(redizo.unique()))
+    rng = np.random.default_rng(seed)
+
+    rows = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for copy in range(copies):
+            parts = [source if copy == 0 else perturb(source, rng)]
+            for rok in added:
+                parts.append(perturb(latest, rng).assign(Rok=rok))
+            df = pd.concat(parts, ignore_index=True)
+            if copy > 0:
+                ranks = rank.reindex(pd.concat([redizo] + [redizo[latest.index]] * len(added))).to_numpy()
+                df[RAW['REDIZO']] = SYNTHETIC_REDIZO + copy * SCHOOLS_PER_COPY + ranks
+                df['Škola'] = df['Škola'] + f" [S{copy}]"
+            df.to_csv(f, header=copy == 0, index=False)
+            rows += len(df)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('out')
+    parser.add_argument('--scale', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rows = generate(args.out, args.scale, args.seed)
+    print(f"{args.out}: {rows} řádků ({os.path.getsize(args.out) / 2**20:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+import analytics
+from memo import figure_cache
+
+# --- SESTAVOVÁNÍ GRAFŮ ---
+# Grafy se staví z memoizovaných tabulek (analytics.py) a samy jsou memoizované
+# v memo.figure_cache se stejným klíčem: verze dat + stav filtrů + další argumenty
+# (vybrané školy, relativní zobrazení...). Opakované zobrazení stejného výřezu
+# (i jiným uživatelem) tak přeskočí melt, mapování popisků i stavbu px/go figury.
+# st.plotly_chart přijímá jen figuru (nebo dict, který znovu validuje), proto se
+# ukládá hotová figura; Streamlit z ní už jen serializuje JSON pro prohlížeč.
+#
+# Vrácené figury jsou sdílené -> volající je nesmí měnit (update_layout apod.).
+
+# Strategická matice: nad WEBGL_POINT_THRESHOLD bodů se bubliny kreslí přes WebGL
+# (scattergl) místo SVG
+WEBGL_POINT_THRESHOLD = 1000
+HEXBIN_GRIDSIZE = 30
+
+AXIS_LABELS = {"Previs_Poptavky": "Převis (Počet uchazečů na 1 místo)", "Uspesnost_Pct": "Úspěšnost (%)"}
+
+PRIO_LABELS = {'Prihlaseni_P1': '1. Priorita', 'Prihlaseni_P2': '2. Priorita', 'Prihlaseni_P3': '3. Priorita'}
+PRIO_COLORS = {'1. Priorita': '#2ca02c', '2. Priorita': '#ff7f0e', '3. Priorita': '#1f77b4'}
+REJECT_LABELS = {
+    'Duvod_Kapacita': 'Nedostačující kapacita',
+    'Duvod_Podminky': 'Nesplnění podmínek',
+    'Duvod_Vyssi_Priorita': 'Přijat na vyšší prioritu (Odliv)'
+}
+REJECT_COLORS = {'Nedostačující kapacita': '#d62728', 'Nesplnění podmínek': '#7f7f7f', 'Přijat na vyšší prioritu (Odliv)': '#9467bd'}
+TOP_LEGEND = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+
+
+def long_form(df, id_col, labels, var_name):
+    # Melt s popisky: přejmenují se 3 sloupce místo mapování řetězců po řádcích
+    return df[[id_col, *labels]].rename(columns=labels).melt(
+        id_vars=[id_col], var_name=var_name, value_name='Pocet')
+
+
+# --- 1. STRATEGICKÁ MATICE ---
+def add_quadrant_guides(fig):
+    # Přidání linek pro orientaci
+    fig.add_vline(x=1, line_dash="dash", line_color="green", annotation_text="Kapacita = Poptávka")
+    fig.add_hline(y=50, line_dash="dash", line_color="gray", annotation_text="50% Šance")
+    return fig
+
+
+def scatter_figure(df_points, title):
+    fig = px.scatter(
+        df_points,
+        x="Previs_Poptavky",
+        y="Uspesnost_Pct",
+        size="Kapacita",
+        color="Zřizovatel",
+        hover_name="Skola_Obor",
+        hover_data={"Kapacita": True, "Prihlaseni": True, "Prijati": True},
+        labels=AXIS_LABELS,
+        title=title,
+        render_mode="webgl" if len(df_points) > WEBGL_POINT_THRESHOLD else "svg",
+    )
+    return add_quadrant_guides(fig)
+
+
+def hexbin_figure(bins, title):
+    # Jeden trace se šestiúhelníky: barva = počet oborů v koši, velikost = kapacita.
+    # Pořadí bodů = bin_id, takže index vybraného bodu je přímo číslo koše.
+    size = np.sqrt(bins['Kapacita'] / bins['Kapacita'].max())
+    fig = go.Figure(go.Scatter(
+        x=bins['x'],
+        y=bins['y'],
+        mode="markers",
+        customdata=bins[['Pocet', 'Kapacita', 'Previs_Poptavky', 'Uspesnost_Pct']].to_numpy(),
+        marker=dict(symbol="hexagon", size=8 + 20 * size, color=bins['Pocet'],
+                    colorscale="Viridis", showscale=True, colorbar=dict(title="Počet oborů"),
+                    line=dict(width=0)),
+        hovertemplate=("Oborů: %{customdata[0]}<br>Kapacita: %{customdata[1]}<br>"
+                       "Převis: %{customdata[2]:.2f}<br>Úspěšnost: %{customdata[3]:.1f} %<extra></extra>"),
+    ))
+    fig.update_layout(title=title, xaxis_title=AXIS_LABELS["Previs_Poptavky"],
+                      yaxis_title=AXIS_LABELS["Uspesnost_Pct"])
+    return add_quadrant_guides(fig)
+
+
+@figure_cache.memoize
+def matrix_scatter(tables, state):
+    return scatter_figure(analytics.final_table(tables, state), f"Mapa škol ({state.rok})")
+
+
+@figure_cache.memoize
+def matrix_hexbin(tables, state):
+    binned = analytics.matrix_bins(tables, state, HEXBIN_GRIDSIZE)
+    if binned is None:
+        return None
+    return hexbin_figure(binned['bins'], f"Hustota škol ({state.rok})")
+
+
+@figure_cache.memoize
+def matrix_drilldown(tables, state, bins):
+    # Body (obory) ve vybraných koších hexbinu; bins = seřazená n-tice čísel košů
+    df_final = analytics.final_table(tables, state)
+    binned = analytics.matrix_bins(tables, state, HEXBIN_GRIDSIZE)
+    df_points = df_final[np.isin(binned['bin_id'], bins)]
+    return scatter_figure(df_points, f"Vybrané obory ({len(df_points)})")
+
+
+# --- 2. + 3. PRIORITY A DŮVODY NEPŘIJETÍ ---
+def priority_rows(tables, state, schools):
+    # Vybrané školy (Skola_Obor), bez výběru TOP 10 podle počtu přihlášek
+    df_final = analytics.final_table(tables, state)
+    if schools:
+        return df_final[df_final['Skola_Obor'].isin(schools)]
+    return df_final.sort_values('Prihlaseni', ascending=False).head(10)
+
+
+@figure_cache.memoize
+def priority_figure(tables, state, schools):
+    # Transformace dat pro Stacked Bar Chart
+    df_melted_prio = long_form(priority_rows(tables, state, schools), 'Skola_Obor', PRIO_LABELS, 'Priorita')
+    return px.bar(
+        df_melted_prio,
+        x='Pocet',
+        y='Skola_Obor',
+        color='Priorita',
+        orientation='h',
+        title="Struktura přihlášek podle priority",
+        text_auto=True,
+        color_discrete_map=PRIO_COLORS
+    )
+
+
+@figure_cache.memoize
+def rejection_figure(tables, state, schools, relative):
+    df_melted_reject = long_form(priority_rows(tables, state, schools), 'Skola_Obor', REJECT_LABELS, 'Duvod')
+    if not relative:
+        return px.bar(
+            df_melted_reject,
+            x='Pocet',
+            y='Skola_Obor',
+            color='Duvod',
+            orientation='h',
+            title="Analýza zamítnutých uchazečů (Absolutní počty)",
+            text_auto=True,
+            color_discrete_map=REJECT_COLORS
+        )
+
+    # Přepočet na procenta z celkového počtu odmítnutých pro každou školu
+    df_totals = df_melted_reject.groupby('Skola_Obor', observed=True)['Pocet'].transform('sum')
+    df_melted_reject['Pocet_Pct'] = (df_melted_reject['Pocet'] / df_totals * 100).fillna(0)
+    return px.bar(
+        df_melted_reject,
+        x='Pocet_Pct',
+        y='Skola_Obor',
+        color='Duvod',
+        orientation='h',
+        title="Struktura důvodů zamítnutí (%)",
+        labels={'Pocet_Pct': 'Podíl (%)'},
+        text_auto='.1f',
+        color_discrete_map=REJECT_COLORS
+    )
+
+
+# --- 4. OBOROVÁ ANALÝZA ---
+@figure_cache.memoize
+def obory_figure(tables, state):
+    df_obory = analytics.obory_table(tables, state)
+    fig = px.bar(
+        df_obory.sort_values('Previs', ascending=False).head(15),
+        x='Previs',
+        y='Obor',
+        orientation='h',
+        title="Top 15 oborů s největším převisem poptávky",
+        labels={'Previs': 'Převis (Počet přihlášek na 1 místo)'},
+        text='Previs',
+        color='Previs',
+        color_continuous_scale='RdYlGn_r'
+    )
+    fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+    return fig
+
+
+# --- 5. MEZIROČNÍ SROVNÁNÍ ---
+def dumbbell_lines(df_plot, x_from, x_to):
+    # Úsečky všech oborů jako jedna čára: [od, do, None] za sebou (None = mezera)
+    n = len(df_plot)
+    x = np.column_stack([df_plot[x_from], df_plot[x_to], np.full(n, np.nan)]).ravel()
+    y = np.repeat(df_plot.index.to_numpy(dtype=object), 3)
+    y[2::3] = None
+    return x, y
+
+
+@figure_cache.memoize
+def dumbbell_figure(tables, state, rok_do):
+    # Posun podílu 1. priorit u top 20 oborů (podle přihlášek v roce rok_do) mezi
+    # rokem rok_do - 1 a rok_do; None, pokud chybí data
+    yoy = analytics.yoy_tables(tables, state)
+    yoy = yoy[yoy['Rok_Do'] == rok_do].set_index('Obor')
+    top_obory = yoy.loc[yoy['Pocet_Do'] > 0, 'Prihlaseni_Do'].sort_values(ascending=False).head(20).index
+    # Jen obory s daty v obou letech
+    df_plot = yoy[(yoy['Pocet_Od'] > 0) & (yoy['Pocet_Do'] > 0) & yoy.index.isin(top_obory)]
+    if df_plot.empty:
+        return None
+    od, do = str(rok_do - 1), str(rok_do)
+    df_plot = df_plot.sort_values(by='Podil_P1_Do', ascending=True) # Seřadíme podle posledního roku
+
+    fig = go.Figure()
+
+    # Čáry spojující body: jeden trace na barvu (růst / pokles)
+    growing = (df_plot['Podil_P1_Do'] >= df_plot['Podil_P1_Od']).to_numpy()
+    for color, mask in [("green", growing), ("red", ~growing)]:
+        if not mask.any():
+            continue
+        x, y = dumbbell_lines(df_plot[mask], 'Podil_P1_Od', 'Podil_P1_Do')
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=y,
+            mode="lines",
+            line=dict(color=color, width=2),
+            showlegend=False,
+            hoverinfo="skip"
+        ))
+
+    # Body pro oba roky (šipky by byly lepší, ale body stačí pro přehlednost)
+    for col, year, color, size, position in [('Podil_P1_Od', od, "gray", 8, "middle left"),
+                                             ('Podil_P1_Do', do, "blue", 10, "middle right")]:
+        fig.add_trace(go.Scatter(
+            x=df_plot[col],
+            y=df_plot.index,
+            mode="markers",
+            name=year,
+            marker=dict(color=color, size=size),
+            texttemplate="%{x:.1f}%",
+            textposition=position,
+            hovertemplate=f"{year}: %{{x:.1f}}%<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title="Posun v prioritách (Top 20 oborů dle zájmu)",
+        xaxis_title="Podíl 1. priorit (%)",
+        yaxis_title="Obor",
+        height=600,
+        margin=dict(l=0, r=0, t=40, b=0)
+    )
+    return fig
+
+
+# --- DETAIL ŠKOLY ---
+@figure_cache.memoize
+def school_priority_figure(tables, state, school):
+    # school = REDIZO
+    # Graf priorit po oborech
+    df_school_prio = long_form(analytics.school_table(tables, state, school), 'Obor', PRIO_LABELS, 'Priorita')
+    fig = px.bar(
+        df_school_prio,
+        x='Pocet',
+        y='Obor',
+        color='Priorita',
+        orientation='h',
+        title="Struktura priorit dle oborů",
+        text_auto=True,
+        color_discrete_map=PRIO_COLORS
+    )
+    fig.update_layout(legend=TOP_LEGEND)
+    return fig
+
+
+@figure_cache.memoize
+def school_reject_figure(tables, state, school):
+    # Graf odmítnutí po oborech
+    df_school_reject = long_form(analytics.school_table(tables, state, school), 'Obor', REJECT_LABELS, 'Duvod')
+    fig = px.bar(
+        df_school_reject,
+        x='Pocet',
+        y='Obor',
+        color='Duvod',
+        orientation='h',
+        title="Důvody nepřijetí dle oborů",
+        text_auto=True,
+        color_discrete_map=REJECT_COLORS
+    )
+    fig.update_layout(legend=TOP_LEGEND)
+    return fig
@@ -0,0 +1,234 @@
+"""Srovnatelné obory jiných škol (k nejbližších sousedů podle metrik).
+
+Dávkový export: pro každý obor ve výběru (rok, kraj, obor) k nejpodobnějších oborů
+jiných škol, s pořadím a vzdáleností, do CSV.
+
+Použití: python comparables.py [--rok 2025] [--kraj "Hlavní město Praha"] [--obor Gymnázium]
+                               [--k 10] [--vsechny-obory] [--out podobne.csv]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import analytics
+
+# --- INDEX SROVNATELNÝCH OBORŮ ---
+# Každý platný řádek kostky (škola x obor x lokalita v daném roce) má vektor metrik:
+#   převis (log), úspěšnost, podíl 1. priorit, index odlivu, skladba důvodů nepřijetí
+#   (podíl kapacity / podmínek / vyšší priority mezi nepřijatými) a kapacita (log).
+# Metriky jsou standardizované v rámci roku a vynásobené odmocninou vah FEATURE_WEIGHTS,
+# takže vzdálenost je obyčejná eukleidovská. Jiný kraj přičte ke čtverci vzdálenosti
+# REGION_PENALTY. Jiné obory téže školy nejsou konkurence, ze sousedů se vynechávají.
+#
+# Řádky jsou seřazené podle roku a oboru -> rok i obor v roce jsou souvislé bloky.
+# Dotaz spočítá vzdálenosti ke všem řádkům bloku najednou (maticově, float32,
+# dávky dotazů tak, aby matice vzdáleností měla nejvýš CELL_BUDGET buněk) a vybere
+# k nejmenších přes argpartition. Staví se jednou při načtení dat (app.load_data),
+# stejně jako index škol.
+FEATURE_WEIGHTS = {
+    'Previs': 1.0,
+    'Uspesnost': 1.0,
+    'Podil_P1': 1.0,
+    'Odliv': 1.0,
+    'Mix_Kapacita': 0.5,
+    'Mix_Podminky': 0.5,
+    'Mix_Vyssi_Priorita': 0.5,
+    'Kapacita_Log': 1.0,
+}
+REGION_PENALTY = 1.0
+DEFAULT_K = 10
+# Buněk matice vzdáleností na dávku (s mezivýsledky, maskami a indexy z argpartition
+# špička ~350 MB); u bloku celého roku ve 100x datech (240 tis. řádků) to je ~65 dotazů
+# na dávku
+CELL_BUDGET = 16_000_000
+
+DISPLAY_COLS = ['Skola_Obor', 'Obor', 'Kraj', 'Kapacita', 'Prihlaseni', 'Previs_Poptavky', 'Uspesnost_Pct',
+                'Podil_P1_Pct', 'Index_Odlivu', 'Vzdalenost']
+
+
+def metric_features(rows):
+    # Surové metriky (před standardizací) pro řádky kostky
+    applicants = rows['Prihlaseni'].to_numpy(dtype='float64')
+    rejected = rows[['Duvod_Kapacita', 'Duvod_Podminky', 'Duvod_Vyssi_Priorita']].to_numpy(dtype='float64')
+    total_rejected = rejected.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p1_share = np.where(applicants > 0, rows['Prihlaseni_P1'].to_numpy() / applicants, 0.0)
+        mix = np.where(total_rejected > 0, rejected / total_rejected, 0.0)
+    return pd.DataFrame({
+        'Previs': np.log1p(rows['Previs_Poptavky'].to_numpy(dtype='float64')),
+        'Uspesnost': rows['Uspesnost_Pct'].to_numpy(dtype='float64') / 100,
+        'Podil_P1': p1_share,
+        'Odliv': rows['Index_Odlivu'].to_numpy(dtype='float64') / 100,
+        'Mix_Kapacita': mix[:, 0],
+        'Mix_Podminky': mix[:, 1],
+        'Mix_Vyssi_Priorita': mix[:, 2],
+        'Kapacita_Log': np.log1p(rows['Kapacita'].to_numpy(dtype='float64')),
+    }, index=rows.index)
+
+
+class ComparableIndex:
+    def __init__(self, rows, vectors, sq_norms, kraj_codes, years, year_offsets, positions, tables):
+        self.rows = rows
+        self.vectors = vectors
+        self.sq_norms = sq_norms
+        self.kraj_codes = kraj_codes
+        self.years = years
+        self.year_offsets = year_offsets
+        self.positions = positions
+        # Dimenze pro popisky (jen odkazy na tabulky, ne kopie)
+        self.dims = {name: tables[name] for name in ['dim_unit', 'dim_school', 'dim_obor', 'dim_location']}
+
+    def labelled(self, positions):
+        # Řádky na pozicích `positions` s popisky Skola_Obor, Obor, Kraj
+        rows = self.rows.iloc[positions]
+        labels = analytics.attach_labels(self.dims, rows, ['Skola_Obor', 'Obor', 'Kraj'])
+        return pd.concat([labels, rows], axis=1).reset_index(drop=True)
+
+    @classmethod
+    def from_tables(cls, tables):
+        cube = tables['cube']
+        valid = cube[cube['Platny'].to_numpy()].sort_values(['Rok', 'obor_id', 'unit_id'], ignore_index=True)
+        # Jen id a čísla; popisky se dotahují až k nalezeným řádkům (labelled)
+        rows = valid[['Rok', 'unit_id', 'school_id', 'obor_id', 'location_id'] + analytics.SUM_COLS
+                     + analytics.DERIVED_COLS].copy()
+        kraj_codes, _ = pd.factorize(tables['dim_location']['Kraj'].to_numpy())
+        kraj_codes = kraj_codes[valid['location_id'].to_numpy()]
+        features = metric_features(valid)
+        rows['Podil_P1_Pct'] = features['Podil_P1'].to_numpy() * 100
+
+        # Standardizace v rámci roku (konstantní metrika -> nula), váhy jako odmocnina
+        years, starts = np.unique(valid['Rok'].to_numpy(), return_index=True)
+        year_offsets = np.append(starts, len(valid))
+        weights = np.sqrt(np.array([FEATURE_WEIGHTS[col] for col in features.columns]))
+        values = features.to_numpy()
+        vectors = np.empty(values.shape, dtype=np.float32)
+        for lo, hi in zip(year_offsets[:-1], year_offsets[1:]):
+            block = values[lo:hi]
+            std = block.std(axis=0)
+            vectors[lo:hi] = (block - block.mean(axis=0)) / np.where(std > 0, std, 1) * weights
+
+        # Pozice řádku podle (rok, unit_id); -1 = jednotka v roce není platná
+        n_units = len(tables['dim_unit'])
+        positions = np.full((len(years), n_units), -1, dtype=np.int32)
+        year_pos = np.searchsorted(years, valid['Rok'].to_numpy())
+        positions[year_pos, valid['unit_id'].to_numpy()] = np.arange(len(valid), dtype=np.int32)
+        return cls(rows, vectors, (vectors ** 2).sum(axis=1), kraj_codes.astype(np.int32),
+                   years, year_offsets, positions, tables)
+
+    def _block(self, rok, obor_id=None):
+        # Rozsah řádků roku (a oboru v něm) jako (lo, hi)
+        y = np.searchsorted(self.years, rok)
+        if y == len(self.years) or self.years[y] != rok:
+            return 0, 0
+        lo, hi = self.year_offsets[y], self.year_offsets[y + 1]
+        if obor_id is None:
+            return lo, hi
+        obor = self.rows['obor_id'].to_numpy()[lo:hi]
+        return lo + np.searchsorted(obor, obor_id, 'left'), lo + np.searchsorted(obor, obor_id, 'right')
+
+    def position(self, unit_id, rok):
+        y = np.searchsorted(self.years, rok)
+        if y == len(self.years) or self.years[y] != rok or not 0 <= unit_id < self.positions.shape[1]:
+            return -1
+        return int(self.positions[y, unit_id])
+
+    def _nearest(self, queries, lo, hi, k):
+        # Pro pozice `queries` (všechny ve stejném bloku lo:hi) k nejbližších -> (pozice, vzdálenosti)
+        block = self.vectors[lo:hi]
+        schools = self.rows['school_id'].to_numpy()
+        k = min(k, hi - lo)
+        out_pos = np.full((len(queries), k), -1, dtype=np.int64)
+        out_dist = np.full((len(queries), k), np.inf)
+        chunk = max(1, CELL_BUDGET // max(hi - lo, 1))
+        for start in range(0, len(queries), chunk):
+            q = queries[start:start + chunk]
+            # |x - y|^2 = |x|^2 + |y|^2 - 2 x.y ; jiný kraj + REGION_PENALTY; stejná škola vynechaná
+            d = self.sq_norms[q][:, None] + self.sq_norms[lo:hi][None, :] - 2 * (self.vectors[q] @ block.T)
+            d += REGION_PENALTY * (self.kraj_codes[q][:, None] != self.kraj_codes[lo:hi][None, :])
+            d[schools[q][:, None] == schools[lo:hi][None, :]] = np.inf
+            if k < hi - lo:
+                part = np.argpartition(d, k - 1, axis=1)[:, :k]
+            else:
+                part = np.broadcast_to(np.arange(hi - lo), d.shape)
+            dist = np.take_along_axis(d, part, axis=1)
+            order = np.argsort(dist, axis=1, kind='stable')
+            out_pos[start:start + len(q)] = lo + np.take_along_axis(part, order, axis=1)
+            out_dist[start:start + len(q)] = np.take_along_axis(dist, order, axis=1)
+        return out_pos, np.sqrt(np.maximum(out_dist, 0))
+
+    def neighbours(self, unit_id, rok, k=DEFAULT_K, same_obor=True):
+        # k nejpodobnějších oborů jiných škol pro jednotku `unit_id` v roce `rok`
+        pos = self.position(unit_id, rok)
+        if pos < 0:
+            return self.labelled([]).assign(Vzdalenost=np.zeros(0))
+        lo, hi = self._block(rok, self.rows['obor_id'].iat[pos] if same_obor else None)
+        found, dist = self._nearest(np.array([pos]), lo, hi, k)
+        keep = np.isfinite(dist[0])
+        return self.labelled(found[0][keep]).assign(Vzdalenost=dist[0][keep])
+
+    def all_neighbours(self, rok, k=DEFAULT_K, same_obor=True, unit_ids=None):
+        # Dávkově pro všechny jednotky roku (nebo jen `unit_ids`): dlouhá tabulka dvojic
+        lo, hi = self._block(rok)
+        queries = np.arange(lo, hi)
+        if unit_ids is not None:
+            queries = queries[np.isin(self.rows['unit_id'].to_numpy()[lo:hi], unit_ids)]
+        if same_obor:
+            obor = self.rows['obor_id'].to_numpy()
+            groups = [(queries[obor[queries] == o], *self._block(rok, o)) for o in np.unique(obor[queries])]
+        else:
+            groups = [(queries, lo, hi)]
+        parts = []
+        for q, block_lo, block_hi in groups:
+            found, dist = self._nearest(q, block_lo, block_hi, k)
+            rank = np.broadcast_to(np.arange(1, found.shape[1] + 1), found.shape)
+            keep = np.isfinite(dist)
+            parts.append(pd.DataFrame({
+                'pos': np.broadcast_to(q[:, None], found.shape)[keep],
+                'Poradi': rank[keep],
+                'soused': found[keep],
+                'Vzdalenost': dist[keep],
+            }))
+        pairs = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(
+            {'pos': [], 'Poradi': [], 'soused': [], 'Vzdalenost': []})
+        query = self.labelled(pairs['pos'].to_numpy(dtype=np.int64))
+        found = self.labelled(pairs['soused'].to_numpy(dtype=np.int64))
+        return pd.DataFrame({
+            'unit_id': query['unit_id'].to_numpy(),
+            'Skola_Obor': query['Skola_Obor'].to_numpy(),
+            'Poradi': pairs['Poradi'].to_numpy(dtype=np.int64),
+            'Soused_unit_id': found['unit_id'].to_numpy(),
+            'Soused_Skola_Obor': found['Skola_Obor'].to_numpy(),
+            'Soused_Kraj': found['Kraj'].to_numpy(),
+            'Vzdalenost': pairs['Vzdalenost'].to_numpy(),
+        }).sort_values(['Skola_Obor', 'Poradi'], ignore_index=True)
+
+
+def main():
+    import etl
+    import filter_index
+    import store
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rok', type=int)
+    parser.add_argument('--kraj', nargs='+')
+    parser.add_argument('--obor', nargs='+')
+    parser.add_argument('--k', type=int, default=DEFAULT_K)
+    parser.add_argument('--vsechny-obory', action='store_true', help="sousedé i z jiných oborů")
+    parser.add_argument('--out', default='podobne_obory.csv')
+    args = parser.parse_args()
+
+    tables = store.load_tables() if store.open_store() else etl.load_tables()
+    tables['filter_index'] = filter_index.FilterIndex.from_tables(tables)
+    index = ComparableIndex.from_tables(tables)
+    rok = args.rok or int(index.years[-1])
+    unit_ids = None
+    if args.kraj or args.obor:
+        unit_ids = analytics.final_table(tables, analytics.filter_state(rok, args.kraj, obor=args.obor))['unit_id']
+    result = index.all_neighbours(rok, args.k, not args.vsechny_obory, unit_ids)
+    result.to_csv(args.out, index=False)
+    print(f"{result['unit_id'].nunique()} oborů, {len(result)} dvojic -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
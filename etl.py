@@ -0,0 +1,468 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import analytics
+
+# --- KONFIGURACE ---
+CSV_PATH = 'data.csv'
+CACHE_DIR_NAME = '.cache'
+
+# Verze ETL logiky. Při změně transformací ji zvyšte -> stará cache se zahodí.
+ETL_VERSION = 9
+
+# Přejmenování sloupců pro snazší práci
+COL_MAP = {
+    'Součet hodnot: Kapacita': 'Kapacita',
+    'Součet hodnot: Přihlášeni': 'Prihlaseni',
+    'Součet hodnot: Přijati': 'Prijati',
+    'Součet hodnot: Přihlášeni - priorita 1': 'Prihlaseni_P1',
+    'Součet hodnot: Přihlášeni - priorita 2': 'Prihlaseni_P2',
+    'Součet hodnot: Přihlášeni - priorita 3': 'Prihlaseni_P3',
+    'Součet hodnot: Přijati - priorita 1': 'Prijati_P1',
+    'Součet hodnot: Přijati - priorita 2': 'Prijati_P2',
+    'Součet hodnot: Přijati - priorita 3': 'Prijati_P3',
+    'Součet hodnot: Nepřijati - nedostačující kapacita': 'Duvod_Kapacita',
+    'Součet hodnot: Nepřijati - nesplnění podmínek': 'Duvod_Podminky',
+    'Součet hodnot: Nepřijati - přijati na vyšší prioritu': 'Duvod_Vyssi_Priorita',
+    'Součet hodnot: REDIZO': 'REDIZO'
+}
+
+# --- SCHÉMA DATOVÝCH TYPŮ ---
+# Textové dimenze držíme jako kategorie (každý řetězec v paměti jen jednou),
+# početní sloupce jako nejužší celé číslo se znaménkem, do kterého se vejde maximum.
+# Znaménkové typy záměrně: z počtů se dál počítají rozdíly (meziroční změny)
+# a bezznaménkový typ by při poklesu přetekl. int8 nepoužíváme (malá rezerva).
+DIMENSION_COLS = ['Kraj', 'Město', 'Okres', 'Obor', 'Škola', 'Zaměření', 'Zřizovatel', 'KKOV', 'SMO16']
+COUNT_COLS = ['Kapacita', 'Prihlaseni', 'Prijati', 'Prihlaseni_P1', 'Prihlaseni_P2', 'Prihlaseni_P3',
+              'Prijati_P1', 'Prijati_P2', 'Prijati_P3', 'Duvod_Kapacita', 'Duvod_Podminky', 'Duvod_Vyssi_Priorita']
+FIXED_DTYPES = {'Rok': 'int16', 'Kolo': 'int8', 'REDIZO': 'int64'}
+COUNT_DTYPES = ['int16', 'int32', 'int64']
+
+# Náhradní celočíselné klíče (viz build_dimensions)
+KEY_COLS = ['school_id', 'obor_id', 'program_id', 'location_id', 'unit_id']
+
+# Platná REDIZO škol jsou devítimístná čísla začínající šestkou
+REDIZO_MIN, REDIZO_MAX = 600_000_000, 700_000_000
+
+
+# --- ETL ---
+def normalize_redizo(s):
+    # Export je kontingenční tabulka ("Součet hodnot: REDIZO"), takže u škol s více
+    # řádky (zaměřeními) v jedné buňce je REDIZO sečtené, např. 2 x 600015360.
+    # Takové hodnoty vydělíme počtem sečtených řádků. Součty dvou různých škol
+    # nejdou rozložit a zůstávají beze změny.
+    values = s.to_numpy(dtype='int64')
+    fixed = values.copy()
+    for k in range(2, 100):
+        base = values // k
+        mask = (fixed >= REDIZO_MAX) & (values % k == 0) & (base >= REDIZO_MIN) & (base < REDIZO_MAX)
+        fixed[mask] = base[mask]
+    return pd.Series(fixed, index=s.index, name=s.name)
+
+
+def normalize_source(df):
+    df = df.rename(columns=COL_MAP)
+    if 'REDIZO' in df.columns:
+        df['REDIZO'] = normalize_redizo(df['REDIZO'])
+
+    # Normalizace názvů oborů (sjednocení pomlček a mezer)
+    # Nahradíme en-dash (–) za hyphen (-) a odstraníme vícenásobné mezery
+    df['Obor'] = df['Obor'].str.replace('–', '-', regex=False).str.replace(r'\s+', ' ', regex=True).str.strip()
+    return df
+
+
+# --- Normalizace názvů škol podle REDIZO ---
+# Cíl: Aby měla škola ve všech letech stejný název (pro grouping a persistenci)
+# Strategie: Vezmeme název z nejnovějšího roku, v rámci roku nejkratší (často bez adresy).
+# Mapování drží i rok a délku vítězného názvu, takže jde aktualizovat přírůstkově:
+# canonical_names(concat([staré mapování, kandidáti z nového exportu])) dá totéž
+# jako přepočet přes celou historii (řazení je stabilní, při shodě vyhrává starší).
+def name_candidates(df):
+    # Unikátní páry REDIZO, Škola, Rok
+    names = df[['REDIZO', 'Škola', 'Rok']].drop_duplicates().dropna(subset=['Škola'])
+    return names.assign(NameLength=names['Škola'].str.len())
+
+
+def canonical_names(candidates):
+    # Seřadíme podle roku sestupně (nejnovější první) a pak podle délky názvu,
+    # pro každé REDIZO vezmeme první (nejnovější/nejkratší) název
+    names = candidates.sort_values(['REDIZO', 'Rok', 'NameLength'], ascending=[True, False, True])
+    return names.drop_duplicates('REDIZO').reset_index(drop=True)
+
+
+def apply_canonical_names(df, names):
+    # Aplikujeme mapování na hlavní dataframe
+    mapping = pd.Series(names['Škola'].to_numpy(), index=names['REDIZO'].to_numpy())
+    df['Škola'] = df['REDIZO'].map(mapping).fillna(df['Škola'])
+    return df
+
+
+def clean_data(df):
+    df = normalize_source(df)
+    if 'REDIZO' in df.columns:
+        df = apply_canonical_names(df, canonical_names(name_candidates(df)))
+    return df
+
+
+# --- STREAMOVANÝ IMPORT S VALIDACÍ ---
+# Zdroj se čte po blocích o CHUNK_ROWS řádcích s pevnými typy (textové dimenze jako
+# str, čísla se převádějí explicitně), každý blok se zvaliduje a hned zredukuje na
+# součty za škola x obor x lokalita x Rok x Kolo. V paměti je tak jen jeden blok
+# a průběžný agregát, jehož velikost závisí na počtu jednotek, ne na počtu řádků
+# (export po uchazečích má stejné sloupce, jen s mnohem víc řádky na jednotku).
+# Zamítnuté řádky se průběžně připisují do CSV reportu (původní sloupce, důvod, číslo řádku).
+CHUNK_ROWS = 20_000
+KNOWN_KOLA = (1, 2)
+AGG_KEYS = ['Rok', 'Kolo', 'REDIZO'] + DIMENSION_COLS
+REQUIRED_COLS = AGG_KEYS + COUNT_COLS
+NUMERIC_COLS = ['Rok', 'Kolo', 'REDIZO'] + COUNT_COLS
+SOURCE_DTYPES = {col: 'str' for col in DIMENSION_COLS}
+# Součet uvedených priorit by neměl přesáhnout celek (export má jen 1.-3. prioritu,
+# takže rovnost platit nemusí). Skutečný export to ale v pár řádcích porušuje (zvláštnost
+# zdroje, ne poškozená data) -> jen varování do reportu, řádek zůstává.
+PRIORITY_PARTS = {
+    'Prihlaseni': ['Prihlaseni_P1', 'Prihlaseni_P2', 'Prihlaseni_P3'],
+    'Prijati': ['Prijati_P1', 'Prijati_P2', 'Prijati_P3'],
+}
+
+
+def _reasons(flags):
+    # Pro řádky s aspoň jedním příznakem text "důvod; důvod" (ostatní řádky vynechané)
+    hit = flags.any(axis=1).to_numpy()
+    names = flags.columns.to_numpy()
+    return pd.Series(['; '.join(names[row]) for row in flags[hit].to_numpy()], index=flags.index[hit], dtype=object)
+
+
+def validate_chunk(df):
+    # Vrací (platné řádky s celočíselnými sloupci, důvody zamítnutí neplatných řádků,
+    # varování k řádkům, které se ponechaly) - důvody i varování jako Series podle indexu
+    values = df[NUMERIC_COLS].apply(pd.to_numeric, errors='coerce')
+    errors = pd.DataFrame({
+        'nečíselná hodnota': values.isna().any(axis=1) | (values % 1 != 0).any(axis=1),
+        'záporný počet': (values[COUNT_COLS] < 0).any(axis=1),
+        'Přijati > Přihlášeni': values['Prijati'] > values['Prihlaseni'],
+        'neznámé kolo': ~values['Kolo'].isin(KNOWN_KOLA),
+    })
+    bad = errors.any(axis=1).to_numpy()
+    warnings = pd.DataFrame({f'součet priorit > {total}': values[parts].sum(axis=1) > values[total]
+                             for total, parts in PRIORITY_PARTS.items()})
+    valid = df[~bad].copy()
+    valid[NUMERIC_COLS] = values[~bad].astype('int64')
+    return valid, _reasons(errors), _reasons(warnings[~bad])
+
+
+def reduce_chunk(agg, df):
+    # Průběžný agregát: součty počtů za AGG_KEYS (NaN v dimenzích je platný klíč)
+    parts = [df] if agg is None else [agg, df]
+    out = pd.concat(parts, ignore_index=True).groupby(AGG_KEYS, dropna=False, sort=False)[COUNT_COLS].sum()
+    return out.reset_index()
+
+
+def stream_source(csv_path, rejected_path=None, chunksize=CHUNK_ROWS):
+    # Vrací (normalizovaný agregát, report {'radky', 'zamitnuto', 'duvody', 'varovani', 'varovani_duvody'}).
+    # Do CSV reportu jdou zamítnuté řádky (Duvod_Zamitnuti) i ponechané řádky s varováním (Varovani).
+    if rejected_path and os.path.exists(rejected_path):
+        os.remove(rejected_path)
+    report = {'radky': 0, 'zamitnuto': 0, 'duvody': {}, 'varovani': 0, 'varovani_duvody': {}}
+    agg, columns = None, None
+    for raw in pd.read_csv(csv_path, chunksize=chunksize, dtype=SOURCE_DTYPES):
+        # Číslo řádku ve zdrojovém souboru (1 = hlavička)
+        raw.index = pd.RangeIndex(report['radky'] + 2, report['radky'] + 2 + len(raw))
+        report['radky'] += len(raw)
+        chunk = raw.rename(columns=COL_MAP)
+        if columns is None:
+            missing = [col for col in REQUIRED_COLS if col not in chunk.columns]
+            if missing:
+                raise ValueError(f"{csv_path}: chybí povinné sloupce {', '.join(missing)}")
+            columns = [col for col in chunk.columns if col in REQUIRED_COLS]
+
+        valid, reasons, warnings = validate_chunk(chunk[columns])
+        if len(reasons) or len(warnings):
+            flagged = raw.loc[reasons.index.union(warnings.index)]
+            flagged = flagged.assign(Duvod_Zamitnuti=reasons.reindex(flagged.index).fillna(''),
+                                     Varovani=warnings.reindex(flagged.index).fillna(''))
+            if rejected_path:
+                first = report['zamitnuto'] + report['varovani'] == 0
+                flagged.to_csv(rejected_path, mode='a', header=first, index_label='Radek')
+            for key, found in [('duvody', reasons), ('varovani_duvody', warnings)]:
+                for reason, n in found.str.split('; ').explode().value_counts().items():
+                    report[key][reason] = report[key].get(reason, 0) + int(n)
+            report['zamitnuto'] += len(reasons)
+            report['varovani'] += len(warnings)
+        agg = reduce_chunk(agg, valid)
+
+    if agg is None:
+        raise ValueError(f"{csv_path}: soubor neobsahuje žádné řádky")
+    # Normalizace REDIZO a názvů oborů závisí jen na klíči, stačí ji udělat jednou
+    # nad agregátem a sloučit jednotky, které se normalizací sešly
+    return reduce_chunk(None, normalize_source(agg))[columns], report
+
+
+def narrowest_int_dtype(s):
+    lo, hi = (int(s.min()), int(s.max())) if len(s) else (0, 0)
+    for dtype in COUNT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return 'int64'
+
+
+def apply_schema(df):
+    df = df.copy()
+    for col in DIMENSION_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col, dtype in FIXED_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    for col in COUNT_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype(narrowest_int_dtype(df[col]))
+    return df
+
+
+def _factorize(df, cols):
+    # Hustá čísla 0..n-1 seřazená podle hodnot klíče (stabilní mezi běhy ETL)
+    codes = df.groupby(cols, sort=True, observed=True, dropna=False).ngroup()
+    return codes.to_numpy(dtype='int32')
+
+
+def build_dimensions(df):
+    # Faktová tabulka dostane celočíselné klíče, popisky jsou v dimenzních tabulkách.
+    #   school_id   -> škola (REDIZO, kanonický název, zřizovatel)
+    #   obor_id     -> obor podle normalizovaného názvu (úroveň, na které dashboard sčítá)
+    #   program_id  -> kód KKOV (každý kód patří právě jednomu oboru)
+    #   location_id -> Kraj + Okres + Město
+    #   unit_id     -> škola x obor x lokalita = jeden řádek v df_final
+    # Ve všech dimenzích platí id == pozice řádku, takže popisky lze dotahovat přes take().
+    df = df.copy()
+    df['school_id'] = _factorize(df, ['REDIZO'])
+    df['obor_id'] = _factorize(df, ['Obor'])
+    df['program_id'] = _factorize(df, ['KKOV'])
+    df['location_id'] = _factorize(df, ['Kraj', 'Okres', 'Město'])
+    df['unit_id'] = _factorize(df, ['school_id', 'obor_id', 'location_id'])
+
+    def dim(id_col, cols, sort_cols=None, ascending=True):
+        out = df.sort_values(sort_cols or [id_col], ascending=ascending).drop_duplicates(id_col)[[id_col] + cols]
+        return out.reset_index(drop=True)
+
+    # Kanonický název a zřizovatel mají být pro REDIZO jednoznačné, bereme poslední rok
+    # (Rok sestupně -> první řádek školy je z nejnovějšího roku, jako u kanonických názvů)
+    dim_school = dim('school_id', ['REDIZO', 'Škola', 'Zřizovatel'], ['school_id', 'Rok'], [True, False])
+    dim_obor = dim('obor_id', ['Obor'])
+    dim_program = dim('program_id', ['KKOV', 'obor_id'])
+    dim_location = dim('location_id', ['Kraj', 'Okres', 'Město'])
+    dim_unit = dim('unit_id', ['school_id', 'obor_id', 'location_id'])
+
+    # Popisek jednotky: "Škola, Město (Obor)". Stejně pojmenované školy (typicky "Gymnázium")
+    # nebo jedna škola ve dvou okresech by splynuly, proto kolize doplníme o REDIZO a okres.
+    school = dim_school.take(dim_unit['school_id'].to_numpy()).reset_index(drop=True)
+    location = dim_location.take(dim_unit['location_id'].to_numpy()).reset_index(drop=True)
+    obor = dim_obor.take(dim_unit['obor_id'].to_numpy()).reset_index(drop=True)
+    label = (school['Škola'].astype(str) + ", " + location['Město'].astype(str)
+             + " (" + obor['Obor'].astype(str) + ")")
+    dup = label.duplicated(keep=False)
+    label[dup] = label[dup] + " [REDIZO " + school.loc[dup, 'REDIZO'].astype(str) + ", okres " + location.loc[dup, 'Okres'].astype(str) + "]"
+    # Zbylé kolize (překlepy v názvu kraje apod.) rozliší číslo jednotky
+    dup = label.duplicated(keep=False)
+    label[dup] = label[dup] + " #" + dim_unit.loc[dup, 'unit_id'].astype(str)
+    dim_unit['Skola_Obor'] = label
+
+    # Popisek školy pro výběr na stránce "Detail školy": "Škola, Město" podle první
+    # lokality školy, stejně pojmenované školy ve stejném městě rozliší REDIZO.
+    first_location = dim_unit.groupby('school_id', sort=True)['location_id'].min().to_numpy()
+    city = dim_location['Město'].take(first_location).astype(str).to_numpy()
+    label = dim_school['Škola'].astype(str) + ", " + city
+    dup = label.duplicated(keep=False)
+    label[dup] = label[dup] + " [REDIZO " + dim_school.loc[dup, 'REDIZO'].astype(str) + "]"
+    dim_school['Skola_Label'] = label
+
+    dims = {
+        'dim_school': dim_school,
+        'dim_obor': dim_obor,
+        'dim_program': dim_program,
+        'dim_location': dim_location,
+        'dim_unit': dim_unit,
+    }
+    return df, dims
+
+
+def memory_report(before, after):
+    # Paměť po sloupcích (deep=True započítá i samotné řetězce)
+    report = pd.DataFrame({
+        'dtype_pred': before.dtypes.astype(str),
+        'bajty_pred': before.memory_usage(deep=True, index=False),
+        'dtype_po': after.dtypes.astype(str),
+        'bajty_po': after.memory_usage(deep=True, index=False),
+    })
+    report['uspora_pct'] = (1 - report['bajty_po'] / report['bajty_pred']) * 100
+    report.loc['CELKEM'] = ['', report['bajty_pred'].sum(), '', report['bajty_po'].sum(),
+                            (1 - report['bajty_po'].sum() / report['bajty_pred'].sum()) * 100]
+    return report
+
+
+def build_tables(df):
+    # Vyčištěné řádky -> faktová tabulka s klíči, dimenze, kostka a meziroční změny
+    df, dims = build_dimensions(apply_schema(df))
+    tables = {'data': df, **dims, 'cube': analytics.build_cube(df, dims)}
+    # Meziroční změny po úrovních (obor, kraj, kraj x obor, škola, škola x obor)
+    tables.update(analytics.build_deltas(tables))
+    return tables
+
+
+def run_etl(csv_path=CSV_PATH):
+    # Stejná validace a redukce jako při ingestu do úložiště (store.py)
+    df, _ = stream_source(csv_path)
+    return build_tables(apply_canonical_names(df, canonical_names(name_candidates(df))))
+
+
+# --- PERSISTENTNÍ CACHE (Parquet vedle CSV) ---
+# Vyčištěné tabulky ukládáme do .cache/<jméno>.<tabulka>.parquet vedle zdrojového CSV.
+# Platnost hlídá otisk zdroje: rychlá kontrola přes velikost + mtime,
+# při neshodě se přepočítá SHA-256 obsahu (změna mtime bez změny dat cache nezneplatní).
+def _cache_paths(csv_path):
+    folder, name = os.path.split(os.path.abspath(csv_path))
+    stem = os.path.splitext(name)[0]
+    cache_dir = os.path.join(folder, CACHE_DIR_NAME)
+    return cache_dir, os.path.join(cache_dir, stem), os.path.join(cache_dir, stem + '.meta.json')
+
+
+def _table_path(prefix, name):
+    return f"{prefix}.{name}.parquet"
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def source_fingerprint(csv_path, meta=None):
+    # Pokud sedí velikost i mtime s uloženými metadaty, hash nepočítáme
+    st = os.stat(csv_path)
+    fp = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'etl_version': ETL_VERSION}
+    if meta and all(meta.get(k) == v for k, v in fp.items()):
+        fp['sha256'] = meta.get('sha256')
+    else:
+        fp['sha256'] = file_digest(csv_path)
+    return fp
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def tmp_path(path):
+    # Dočasný soubor vedle cílového, jedinečný pro proces i vlákno (sessions Streamlitu
+    # jsou vlákna jednoho procesu) -> souběžné zápisy si nepřepisují rozpracovaný soubor
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+def _write_meta(meta_path, meta):
+    tmp_meta = tmp_path(meta_path)
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_path)
+
+
+def _write_cache(tables, cache_dir, prefix, meta_path, fingerprint):
+    # Zápis přes dočasný soubor + os.replace, aby souběžný start nikdy nečetl polovičatý soubor.
+    # Metadata se zapisují až nakonec -> platná cache vždy odkazuje na kompletní sadu tabulek.
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for name, df in tables.items():
+            path = _table_path(prefix, name)
+            tmp = tmp_path(path)
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        _write_meta(meta_path, {**fingerprint, 'tables': sorted(tables)})
+    except OSError:
+        # Read-only souborový systém apod. -> aplikace funguje i bez cache
+        pass
+
+
+def _read_cache(prefix, names):
+    try:
+        return {name: pd.read_parquet(_table_path(prefix, name)) for name in names}
+    except (OSError, ValueError):
+        return None
+
+
+def _data_version(fingerprint):
+    # Verze dat pro klíče odvozených cache (memo.py): obsah CSV + verze ETL
+    return f"{fingerprint['sha256'][:16]}-v{ETL_VERSION}"
+
+
+def load_tables(csv_path=CSV_PATH, use_cache=True):
+    if not use_cache:
+        tables = run_etl(csv_path)
+        tables['version'] = _data_version({'sha256': file_digest(csv_path)})
+        return tables
+
+    cache_dir, prefix, meta_path = _cache_paths(csv_path)
+    meta = _read_meta(meta_path)
+    fingerprint = source_fingerprint(csv_path, meta)
+
+    if meta and meta.get('sha256') == fingerprint['sha256'] and meta.get('etl_version') == ETL_VERSION:
+        tables = _read_cache(prefix, meta.get('tables', []))
+        if tables:
+            # Data stejná, jen se změnil mtime (např. git checkout) -> obnovíme metadata
+            if any(meta.get(k) != v for k, v in fingerprint.items()):
+                try:
+                    _write_meta(meta_path, {**fingerprint, 'tables': meta['tables']})
+                except OSError:
+                    pass
+            tables['version'] = _data_version(fingerprint)
+            return tables
+
+    tables = run_etl(csv_path)
+    _write_cache(tables, cache_dir, prefix, meta_path, fingerprint)
+    tables['version'] = _data_version(fingerprint)
+    return tables
+
+
+def load_data(csv_path=CSV_PATH, use_cache=True):
+    return load_tables(csv_path, use_cache)['data']
+
+
+def clear_cache(csv_path=CSV_PATH):
+    cache_dir, prefix, meta_path = _cache_paths(csv_path)
+    paths = [meta_path]
+    if os.path.isdir(cache_dir):
+        base = os.path.basename(prefix) + '.'
+        paths += [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.startswith(base) and f.endswith('.parquet')]
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == '__main__':
+    # Ruční přegenerování cache: python etl.py [cesta.csv]
+    # Report paměti po sloupcích:  python etl.py --memory-report [cesta.csv]
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    path = args[0] if args else CSV_PATH
+    if '--memory-report' in sys.argv:
+        raw = clean_data(pd.read_csv(path))
+        with pd.option_context('display.width', 200, 'display.float_format', '{:.1f}'.format):
+            print(memory_report(raw, apply_schema(raw)))
+        sys.exit(0)
+    clear_cache(path)
+    t0 = time.perf_counter()
+    tables = load_tables(path)
+    print(f"ETL hotovo: {len(tables['data'])} řádků za {(time.perf_counter() - t0) * 1000:.0f} ms, "
+          f"cache uložena do {_cache_paths(path)[0]}")
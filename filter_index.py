@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# --- INVERTOVANÝ INDEX PRO FILTRY ---
+# Pro každou filtrovací dimenzi (Rok, Kraj, Město, Obor, Škola) si pamatujeme,
+# na kterých řádcích kostky se daná hodnota vyskytuje. Řádky jsou uložené jako
+# jedno pole pozic seřazené podle hodnoty + offsety (CSR), takže seznam pozic
+# pro hodnotu je jen výřez pole a nic se nekopíruje.
+#
+# Kombinace filtrů: vezmeme nejmenší množinu pozic (nejselektivnější dimenzi)
+# a ostatní dimenze jen ověříme přes pole kódů -> cena je úměrná velikosti
+# výsledku, ne velikosti tabulky.
+
+
+class _Dimension:
+    def __init__(self, codes, values):
+        # codes: kód hodnoty pro každý řádek, values: hodnota pro každý kód
+        self.codes = codes
+        self.values = values
+        self.lookup = {v: i for i, v in enumerate(values)}
+        counts = np.bincount(codes, minlength=len(values))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.order = np.argsort(codes, kind='stable').astype(np.int32)
+
+    def value_codes(self, selected):
+        return [self.lookup[v] for v in selected if v in self.lookup]
+
+    def positions(self, codes):
+        parts = [self.order[self.offsets[c]:self.offsets[c + 1]] for c in codes]
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int32)
+
+    def size(self, codes):
+        return int(sum(self.offsets[c + 1] - self.offsets[c] for c in codes))
+
+
+class FilterIndex:
+    def __init__(self, dimensions, n_rows):
+        self.dimensions = dimensions
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_tables(cls, tables):
+        # Kódy se faktorizují na malých dimenzních tabulkách a na řádky kostky
+        # se jen rozkopírují přes celočíselné klíče (žádné porovnávání řetězců po řádcích)
+        cube = tables['cube']
+        sources = {
+            'Kraj': ('dim_location', 'location_id'),
+            'Město': ('dim_location', 'location_id'),
+            'Obor': ('dim_obor', 'obor_id'),
+            'Škola': ('dim_school', 'school_id'),
+        }
+        codes, values = pd.factorize(cube['Rok'].to_numpy(), sort=True)
+        dimensions = {'Rok': _Dimension(codes.astype(np.int32), list(values))}
+        for name, (dim, key) in sources.items():
+            dim_codes, values = pd.factorize(tables[dim][name].to_numpy(), sort=True)
+            codes = dim_codes.astype(np.int32)[cube[key].to_numpy()]
+            dimensions[name] = _Dimension(codes, list(values))
+        return cls(dimensions, len(cube))
+
+    def _selection(self, filters):
+        # {dimenze: seznam kódů} pro zadané (neprázdné) filtry
+        selection = {}
+        for name, selected in filters.items():
+            if selected is None or (not np.isscalar(selected) and len(selected) == 0):
+                continue
+            if np.isscalar(selected):
+                selected = [selected]
+            selection[name] = self.dimensions[name].value_codes(selected)
+        return selection
+
+    def positions(self, **filters):
+        # Pozice řádků kostky, které splňují všechny filtry (seřazené vzestupně).
+        # Klíče: Rok, Kraj, Město, Obor, Škola; hodnota je skalár nebo seznam (OR uvnitř dimenze).
+        selection = self._selection(filters)
+        if not selection:
+            return np.arange(self.n_rows, dtype=np.int32)
+
+        # Začneme nejmenší množinou, zbylé dimenze jen ověříme přes kódy
+        driver = min(selection, key=lambda name: self.dimensions[name].size(selection[name]))
+        pos = self.dimensions[driver].positions(selection[driver])
+        for name, codes in selection.items():
+            if name == driver or len(pos) == 0:
+                continue
+            dim = self.dimensions[name]
+            allowed = np.zeros(len(dim.values), dtype=bool)
+            allowed[codes] = True
+            pos = pos[allowed[dim.codes[pos]]]
+        return pos
+
+    def facet(self, name, **filters):
+        # Počty řádků pro každou hodnotu dimenze `name` při ostatních filtrech
+        # (např. Město v rámci vybraných krajů). Vrací Series hodnota -> počet, jen nenulové.
+        filters.pop(name, None)
+        dim = self.dimensions[name]
+        if self._selection(filters):
+            counts = np.bincount(dim.codes[self.positions(**filters)], minlength=len(dim.values))
+        else:
+            counts = np.diff(dim.offsets)
+        out = pd.Series(counts, index=dim.values, name='Pocet')
+        return out[out > 0]
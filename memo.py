@@ -0,0 +1,143 @@
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import perf
+
+# --- SDÍLENÁ MEMOIZACE ODVOZENÝCH TABULEK ---
+# Cache žije na úrovni modulu, takže ji sdílí všechny sessions v jednom procesu
+# (Streamlit při rerunu znovu spouští jen app.py, importované moduly zůstávají).
+# Klíčem je verze dat + normalizovaný stav filtrů, takže oblíbené kombinace
+# (např. "Hlavní město Praha, 2025") se spočítají jednou pro všechny uživatele.
+#
+# Vrácené objekty jsou sdílené -> volající je nesmí měnit (jen číst / kopírovat).
+# U derived_cache to hlídá freeze(): pole pod uloženými tabulkami jsou jen pro čtení.
+#
+# Konfigurace přes proměnné prostředí:
+#   JPZ_CACHE_MAX_ENTRIES  maximální počet položek (LRU vyhazování), výchozí 256
+#   JPZ_CACHE_TTL          životnost položky v sekundách, 0 = bez omezení, výchozí 3600
+#   JPZ_FIGURE_CACHE_MAX_ENTRIES  maximální počet sestavených grafů (charts.py), výchozí 64
+DEFAULT_MAX_ENTRIES = int(os.environ.get('JPZ_CACHE_MAX_ENTRIES', 256))
+DEFAULT_TTL = float(os.environ.get('JPZ_CACHE_TTL', 3600))
+FIGURE_MAX_ENTRIES = int(os.environ.get('JPZ_FIGURE_CACHE_MAX_ENTRIES', 64))
+
+
+# --- SDÍLENÁ DATA JEN PRO ČTENÍ ---
+# Tabulky sdílené mezi sessions (načtená data v app.py přes st.cache_resource,
+# výsledky derived_cache) se nekopírují, proto jim numpy pole přepneme na
+# writeable=False: zápis do hodnot (df.loc[...] = ..., arr[...] = ...) pak skončí
+# ValueError místo tiché změny dat všem uživatelům. Přidání / nahrazení celého
+# sloupce pandas nezastaví -> sdílené tabulky se v sessions jen čtou nebo kopírují.
+def _freeze_array(values):
+    # numpy bloky přímo, kategorie / datumy přes vnitřní ndarray; textové sloupce
+    # (Arrow) takto ohlídat nejde, pandas při zápisu vymění celé pole
+    arr = values if isinstance(values, np.ndarray) else getattr(values, '_ndarray', None)
+    if isinstance(arr, np.ndarray):
+        arr.flags.writeable = False
+
+
+def freeze(obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        for block in obj._mgr.blocks:
+            _freeze_array(block.values)
+    elif isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            freeze(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            freeze(value)
+    elif hasattr(obj, '__dict__') and not isinstance(obj, type):
+        # Indexy (filter_index.FilterIndex, school_index.SchoolIndex)
+        freeze(vars(obj))
+    return obj
+
+
+class LRUCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, read_only=False):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.read_only = read_only
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, name, what):
+        stats = self._stats.setdefault(name, {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0})
+        stats[what] += 1
+
+    def get(self, key, name):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, created = item
+                if self.ttl and time.monotonic() - created > self.ttl:
+                    del self._data[key]
+                    self._count(name, 'expired')
+                else:
+                    self._data.move_to_end(key)
+                    self._count(name, 'hits')
+                    return True, value
+            self._count(name, 'misses')
+            return False, None
+
+    def put(self, key, value, name):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                old_key, _ = self._data.popitem(last=False)
+                self._count(old_key[0], 'evictions')
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._stats.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        # Počítadla po funkcích (hits / misses / evictions / expired) + aktuální obsazenost
+        with self._lock:
+            sizes = pd.Series([key[0] for key in self._data], dtype=object).value_counts()
+            out = pd.DataFrame.from_dict(self._stats, orient='index',
+                                         columns=['hits', 'misses', 'evictions', 'expired'])
+        out['entries'] = sizes.reindex(out.index).fillna(0).astype(int)
+        total = out['hits'] + out['misses']
+        out['hit_rate_pct'] = (out['hits'] / total.where(total > 0) * 100).fillna(0)
+        return out
+
+    def memoize(self, fn):
+        # Dekorátor pro funkce tvaru fn(tables, *args): první argument se do klíče
+        # nepromítá celý, jen jeho verze (tables['version']), ostatní argumenty musí být hashovatelné.
+        name = fn.__name__
+
+        # Každé volání je etapa měření (perf.py) se stavem hit / miss
+        @functools.wraps(fn)
+        def wrapper(tables, *args):
+            with perf.stage(name):
+                key = (name, tables.get('version'), args)
+                hit, value = self.get(key, name)
+                perf.cache_event(hit)
+                if hit:
+                    return value
+                value = fn(tables, *args)
+                if self.read_only:
+                    freeze(value)
+                self.put(key, value, name)
+                return value
+
+        wrapper.uncached = fn
+        return wrapper
+
+
+derived_cache = LRUCache(read_only=True)
+# Grafy jsou větší než odvozené tabulky (u matice stovky kB), proto mají vlastní menší cache
+figure_cache = LRUCache(max_entries=FIGURE_MAX_ENTRIES)
@@ -0,0 +1,123 @@
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# --- MĚŘENÍ ETAP SKRIPTU ---
+# Jeden běh skriptu (rerun app.py, případně samostatný rerun fragmentu) se rozpadne na
+# pojmenované etapy: načtení dat, filtry, agregace, každá memoizovaná funkce (memo.py,
+# včetně stavby grafů v charts.py) a každé st.plotly_chart / st.dataframe ve views.py.
+#
+#   perf.start_run()               začátek běhu (app.py, resp. fragment ve views.py)
+#   with perf.stage('nazev'): ...  etapa; vnořené etapy mají větší hloubku
+#   perf.cache_event(hit)          výsledek cache uvnitř etapy (memo.py, st.cache_resource)
+#   perf.finish_run()              konec běhu -> souhrn
+#
+# Každá etapa má čas v ms a stav cache: 'hit' (vše z cache), 'miss' (něco se počítalo),
+# prázdný = bez cache. Záznamy jdou jako JSON řádky do loggeru "jpz.perf" a běh si
+# drží i panel "Výkon" v sidebaru (views.debug_panel).
+#
+# Běh se zaznamenává, jen když je zapnutý log (proměnná prostředí JPZ_PERF_LOG=1 ->
+# stderr, jiná hodnota = cesta k souboru) nebo panel (?debug=1 v URL, JPZ_DEBUG_PANEL=1).
+# Jinak je stage() jen čtení thread-local proměnné a sdílený prázdný context manager.
+LOG_TARGET = os.environ.get('JPZ_PERF_LOG', '')
+PANEL_DEFAULT = os.environ.get('JPZ_DEBUG_PANEL', '') not in ('', '0')
+
+log = logging.getLogger('jpz.perf')
+if LOG_TARGET not in ('', '0'):
+    log.addHandler(logging.StreamHandler(sys.stderr) if LOG_TARGET == '1' else logging.FileHandler(LOG_TARGET))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+# Každá session běží ve vlastním vlákně skriptu -> rozpracovaný běh je thread-local
+class _Local(threading.local):
+    run = None  # výchozí hodnota v každém vlákně (bez výjimky v getattr)
+
+
+_local = _Local()
+_run_ids = itertools.count(1)
+
+
+class _NoStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class _Stage:
+    __slots__ = ('run', 'name', 'cached', 'depth', 'hits', 'misses', 't0')
+
+    def __init__(self, run, name, cached):
+        self.run, self.name, self.cached = run, name, cached
+
+    def __enter__(self):
+        run = self.run
+        self.depth = len(run['open'])
+        self.hits, self.misses = run['hits'], run['misses']
+        run['open'].append(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.t0) * 1000
+        run = self.run
+        run['open'].pop()
+        misses, hits = run['misses'] - self.misses, run['hits'] - self.hits
+        cache = 'miss' if misses else 'hit' if hits or self.cached else ''
+        record = {'stage': self.name, 'depth': self.depth, 'start_ms': (self.t0 - run['t0']) * 1000,
+                  'ms': ms, 'cache': cache}
+        run['stages'].append(record)
+        if log.handlers:
+            log.info(json.dumps({'event': 'stage', 'run': run['id'], 'kind': run['kind'], **record},
+                                ensure_ascii=False))
+        return False
+
+
+def start_run(panel=False, kind='script'):
+    # Vrací rozpracovaný běh (dict), nebo None, když se neměří
+    if not (panel or log.handlers):
+        _local.run = None
+        return None
+    _local.run = {'id': next(_run_ids), 'kind': kind, 'start': time.time(), 't0': time.perf_counter(),
+                  'stages': [], 'open': [], 'hits': 0, 'misses': 0}
+    return _local.run
+
+
+def active():
+    return _local.run is not None
+
+
+def stage(name, cached=False):
+    # cached=True: etapa bez hlášené chyby cache je 'hit' (st.cache_resource hlásí jen miss)
+    run = _local.run
+    if run is None:
+        return _NO_STAGE
+    return _Stage(run, name, cached)
+
+
+def cache_event(hit):
+    run = _local.run
+    if run is not None:
+        run['hits' if hit else 'misses'] += 1
+
+
+def finish_run():
+    # Uzavře běh a vrátí souhrn {'id', 'kind', 'start', 'ms', 'stages'}; None, když se neměřilo
+    run = _local.run
+    _local.run = None
+    if run is None:
+        return None
+    summary = {'id': run['id'], 'kind': run['kind'], 'start': run['start'],
+               'ms': (time.perf_counter() - run['t0']) * 1000, 'stages': run['stages']}
+    if log.handlers:
+        log.info(json.dumps({'event': 'run', 'run': run['id'], 'kind': run['kind'], 'ms': summary['ms'],
+                             'stages': len(run['stages']), 'hits': run['hits'], 'misses': run['misses']}))
+    return summary
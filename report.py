@@ -0,0 +1,224 @@
+"""Dávkové statické reporty po krajích (a volitelně po školách) bez Streamlitu.
+
+Pro každou kombinaci Kraj x Rok (s --schools i pro každou školu x Rok) sestaví
+stejné tabulky jako dashboard (analytics.py: df_final a jeho souhrn, žebříček
+oborů, "Jistoty", meziroční skokani/propady, srovnání škol s trhem, u škol i nejpodobnější
+obory jiných škol) a uloží je jako HTML / Parquet / CSV do <out>/<rok>/kraje/<kraj>/
+resp. <out>/<rok>/skoly/<REDIZO>/.
+
+Úlohy běží paralelně v procesech. Data se načtou jednou v hlavním procesu a workery
+je při forku zdědí (copy-on-write), bez nového čtení CSV / Parquet; předem se
+spočítá i sdílený benchmark trhu pro každý rok. Časy jednotlivých úloh a celkový
+čas se vypíšou a uloží do <out>/timings.csv.
+
+Použití: python report.py [--out reports] [--years 2025] [--kraje "Hlavní město Praha"]
+                          [--schools] [--formats html parquet csv] [--workers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import analytics
+import charts
+import comparables
+import etl
+import filter_index
+import school_index
+import store
+
+FORMATS = ['html', 'parquet', 'csv']
+SIMILAR_K = 5
+
+# Tabulky načtené v hlavním procesu; workery je dědí při forku
+_TABLES = None
+
+
+def load_tables():
+    # Stejný zdroj jako app.py (úložiště, jinak CSV), ale všechny roky najednou
+    tables = store.load_tables() if store.open_store() else etl.load_tables()
+    tables['filter_index'] = filter_index.FilterIndex.from_tables(tables)
+    tables['school_index'] = school_index.SchoolIndex.from_tables(tables)
+    tables['comparable_index'] = comparables.ComparableIndex.from_tables(tables)
+    return tables
+
+
+def _init_worker():
+    # Bez forku (spawn) si worker načte tabulky sám -> z Parquet cache, ne z CSV
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = load_tables()
+
+
+def slugify(text):
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+# --- OBSAH REPORTŮ ---
+# Každá úloha vrací (nadpis, {sekce: DataFrame}, [grafy]); sekce se uloží jako
+# samostatné Parquet / CSV soubory a do HTML jako tabulky.
+def totals_row(df, **labels):
+    capacity, applicants, accepted = (df[col].sum() for col in ['Kapacita', 'Prihlaseni', 'Prijati'])
+    return pd.DataFrame([{
+        **labels,
+        'Oboru': len(df),
+        'Kapacita': capacity,
+        'Prihlaseni': applicants,
+        'Prijati': accepted,
+        'Previs': applicants / capacity if capacity > 0 else 0,
+        'Uspesnost_Pct': accepted / applicants * 100 if applicants > 0 else 0,
+    }])
+
+
+def kraj_report(tables, rok, kraj):
+    state = analytics.filter_state(rok, [kraj])
+    df_final = analytics.final_table(tables, state)
+    df_obory = analytics.obory_table(tables, state).sort_values('Previs', ascending=False, ignore_index=True)
+    df_obory.insert(0, 'Poradi', range(1, len(df_obory) + 1))
+    schools = analytics.market_benchmark(tables, rok)['schools']
+    schools = schools[schools['REDIZO'].isin(df_final['REDIZO'].unique())].sort_values('Poradi_Previs')
+
+    sections = {
+        'souhrn': totals_row(df_final, Kraj=kraj, Rok=rok),
+        'obory': df_obory,
+        'jistoty': analytics.top_picks(df_final),
+        'skoly': schools[analytics.BENCHMARK_DISPLAY_COLS],
+        'df_final': df_final.drop(columns=['unit_id']),
+    }
+    figures = [charts.obory_figure(tables, state)]
+
+    # Meziroční srovnání jako na dashboardu: dvojice let končící rokem reportu
+    yoy = analytics.yoy_tables(tables, state._replace(rok=None))
+    pair = analytics.yoy_pair(yoy, rok)
+    if pair is not None and pair[1] == rok:
+        growers, losers = analytics.yoy_movers(yoy, pair)
+        sections['skokani'] = growers.reset_index()
+        sections['pokles'] = losers.reset_index()
+        fig_dumbbell = charts.dumbbell_figure(tables, state._replace(rok=None), rok)
+        if fig_dumbbell is not None:
+            figures.append(fig_dumbbell)
+    return f"{kraj} ({rok})", sections, figures
+
+
+def school_report(tables, rok, redizo):
+    state = analytics.filter_state(rok)
+    df_school = analytics.school_table(tables, state, redizo)
+    label = tables['school_index'].label(redizo)
+    summary = totals_row(df_school, REDIZO=redizo, Skola=label, Rok=rok)
+    benchmark = analytics.school_benchmark(tables, state, redizo)
+    summary['Trh_Previs'] = benchmark['avg_previs'] if benchmark else 0
+    summary['Trh_Uspesnost_Pct'] = benchmark['avg_uspesnost'] if benchmark else 0
+
+    display_cols = ['Obor', 'Kapacita', 'Prihlaseni', 'Meziroční změna', 'Prijati', 'Previs_Poptavky', 'Uspesnost_Pct']
+    sections = {
+        'souhrn': summary,
+        'obory': df_school[display_cols].sort_values('Prihlaseni', ascending=False),
+        # Nejpodobnější obory jiných škol ke každému oboru školy (comparables.py)
+        'podobne': tables['comparable_index'].all_neighbours(rok, SIMILAR_K, True, df_school['unit_id']),
+    }
+    figures = [charts.school_priority_figure(tables, state, redizo),
+               charts.school_reject_figure(tables, state, redizo)]
+    return f"{label} ({rok})", sections, figures
+
+
+def render_html(title, sections, figures):
+    # df_final jde jen do Parquet / CSV (stovky řádků), HTML ukazuje přehledové tabulky
+    parts = [f"<h1>{title}</h1>"]
+    for name, df in sections.items():
+        if name != 'df_final':
+            parts.append(f"<h2>{name}</h2>" + df.to_html(index=False, float_format='{:.2f}'.format, border=0))
+    for i, fig in enumerate(figures):
+        parts.append(fig.to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False))
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title></head><body>{''.join(parts)}</body></html>"
+
+
+def write_report(folder, title, sections, figures, formats):
+    os.makedirs(folder, exist_ok=True)
+    files = 0
+    for name, df in sections.items():
+        if 'parquet' in formats:
+            df.to_parquet(os.path.join(folder, f"{name}.parquet"), index=False)
+            files += 1
+        if 'csv' in formats:
+            df.to_csv(os.path.join(folder, f"{name}.csv"), index=False)
+            files += 1
+    if 'html' in formats:
+        with open(os.path.join(folder, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(render_html(title, sections, figures))
+        files += 1
+    return files
+
+
+def run_task(task, out_dir, formats):
+    # Jedna úloha = jeden report; vrací (druh, rok, klíč, čas v ms, počet souborů)
+    kind, rok, key = task
+    t0 = time.perf_counter()
+    if kind == 'kraj':
+        title, sections, figures = kraj_report(_TABLES, rok, key)
+        folder = os.path.join(out_dir, str(rok), 'kraje', slugify(key))
+    else:
+        title, sections, figures = school_report(_TABLES, rok, key)
+        folder = os.path.join(out_dir, str(rok), 'skoly', str(key))
+    files = write_report(folder, title, sections, figures, formats)
+    return kind, rok, key, (time.perf_counter() - t0) * 1000, files
+
+
+def plan_tasks(tables, years, kraje, schools):
+    index = tables['filter_index']
+    tasks = []
+    for rok in years:
+        tasks += [('kraj', rok, kraj) for kraj in sorted(kraje or index.facet('Kraj', Rok=rok).index)]
+        if schools:
+            tasks += [('skola', rok, redizo) for redizo in analytics.school_options(tables, analytics.filter_state(rok, kraje))]
+    return tasks
+
+
+def main():
+    global _TABLES
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='reports')
+    parser.add_argument('--years', type=int, nargs='+')
+    parser.add_argument('--kraje', nargs='+')
+    parser.add_argument('--schools', action='store_true', help="i report pro každou školu")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=FORMATS)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    t_start = time.perf_counter()
+    _TABLES = load_tables()
+    years = args.years or sorted(_TABLES['filter_index'].facet('Rok').index)
+    # Benchmark trhu (jeden pro celý rok) spočítáme před forkem -> workery ho zdědí v memo cache
+    for rok in years:
+        analytics.market_benchmark(_TABLES, rok)
+    tasks = plan_tasks(_TABLES, years, args.kraje, args.schools)
+    t_loaded = time.perf_counter()
+    print(f"Data načtena za {(t_loaded - t_start) * 1000:.0f} ms, úloh: {len(tasks)}, procesů: {args.workers}")
+
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    timings = []
+    with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context(method),
+                             initializer=_init_worker) as pool:
+        futures = [pool.submit(run_task, task, args.out, args.formats) for task in tasks]
+        for future in as_completed(futures):
+            kind, rok, key, ms, files = future.result()
+            timings.append({'druh': kind, 'rok': rok, 'klic': key, 'ms': ms, 'souboru': files})
+            print(f"{kind:<6}{rok:>6}  {str(key):<40}{ms:>9.0f} ms")
+
+    wall = (time.perf_counter() - t_start) * 1000
+    df_timings = pd.DataFrame(timings)
+    os.makedirs(args.out, exist_ok=True)
+    df_timings.to_csv(os.path.join(args.out, 'timings.csv'), index=False)
+    task_ms = df_timings['ms'].sum() if len(df_timings) else 0
+    print(f"Hotovo: {len(tasks)} reportů, {df_timings['souboru'].sum() if len(df_timings) else 0} souborů "
+          f"v {args.out}; celkem {wall:.0f} ms (načtení {(t_loaded - t_start) * 1000:.0f} ms, "
+          f"součet úloh {task_ms:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
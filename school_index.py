@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+import analytics
+
+# --- INDEX ŠKOL PRO STRÁNKU "DETAIL ŠKOLY" ---
+# Řádky škola x obor (platné jednotky kostky) za všechny roky, seřazené podle
+# školy a roku, takže řádky jedné školy jsou souvislý blok (offsety jako CSR
+# ve filter_index.py) a výběr školy je jen vyhledání ve slovníku + výřez.
+#
+# Ke každému řádku je předpočítaný součet přihlášek stejné školy a oboru
+# v předchozím roce (všechna kola i neplatné jednotky, jako dřív merge na 'Obor')
+# a hotový text sloupce "Meziroční změna".
+#
+# Klíčem je REDIZO: název školy není jednoznačný ("Gymnázium" má desítky škol).
+
+
+def format_change(prev, diff, pct):
+    # "↑ 12 (+8.5%)", "↓ -3 (-2.1%)", "0 (0.0%)", bez loňského řádku "Nový obor"
+    change = np.char.add(np.char.mod('%d', diff.astype(np.int64)),
+                         np.char.add(np.char.mod(' (%+.1f', pct), '%)')).astype(object)
+    text = np.where(diff > 0, "↑ " + change, np.where(diff < 0, "↓ " + change, "0 (0.0%)"))
+    return np.where(np.isnan(prev), "Nový obor", text)
+
+
+class SchoolIndex:
+    def __init__(self, rows, offsets, school_ids, labels, school_years):
+        self.rows = rows
+        self.offsets = offsets
+        self.school_ids = school_ids
+        self.labels = labels
+        self.school_years = school_years
+
+    @classmethod
+    def from_tables(cls, tables):
+        cube = tables['cube']
+        valid = cube[cube['Platny'].to_numpy()]
+        labels = analytics.attach_labels(tables, valid, analytics.LABEL_COLS + ['REDIZO'])
+        rows = pd.concat([labels, valid[['Rok', 'school_id', 'obor_id', 'location_id']
+                                        + analytics.SUM_COLS + analytics.DERIVED_COLS + ['unit_id']]], axis=1)
+        # V rámci školy a roku stejné pořadí jako v df_final (podle Skola_Obor)
+        rows = rows.sort_values(['school_id', 'Rok', 'Skola_Obor'], ignore_index=True)
+
+        # Přihlášky stejné školy a oboru o rok dřív (součet přes lokality, kola i neplatné
+        # jednotky) z materializované meziroční tabulky; obor bez loňského řádku -> NaN
+        prev = tables['delta_skola_obor']
+        prev = prev.loc[prev['Pocet_Od'] > 0, ['school_id', 'obor_id', 'Rok_Do', 'Prihlaseni_Od']]
+        prev = prev.rename(columns={'Rok_Do': 'Rok', 'Prihlaseni_Od': 'Prihlaseni_Prev'})
+        rows = rows.merge(prev, on=['school_id', 'obor_id', 'Rok'], how='left')
+
+        prev_apps = rows['Prihlaseni_Prev'].to_numpy(dtype=float)
+        diff = rows['Prihlaseni'].to_numpy() - prev_apps
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = diff / prev_apps * 100
+        rows['Zmena_Abs'] = np.nan_to_num(diff, nan=0.0)
+        rows['Zmena_Pct'] = np.where(np.isnan(pct), 0.0, pct)
+        rows['Meziroční změna'] = format_change(prev_apps, rows['Zmena_Abs'].to_numpy(), rows['Zmena_Pct'].to_numpy())
+
+        dim_school = tables['dim_school']
+        counts = np.bincount(rows['school_id'].to_numpy(), minlength=len(dim_school))
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        school_ids = dict(zip(dim_school['REDIZO'].tolist(), dim_school['school_id'].tolist()))
+        labels = dict(zip(dim_school['REDIZO'].tolist(), dim_school['Skola_Label'].tolist()))
+        # Roky, ve kterých má škola v kostce jakýkoli řádek (i neplatný)
+        school_years = set(zip(cube['school_id'].tolist(), cube['Rok'].tolist()))
+        return cls(rows, offsets, school_ids, labels, school_years)
+
+    def school_rows(self, redizo, rok=None):
+        # Řádky školy (všechny roky, nebo jen `rok`) jako výřez bez kopírování
+        school_id = self.school_ids.get(redizo)
+        if school_id is None:
+            return self.rows.iloc[:0]
+        block = self.rows.iloc[self.offsets[school_id]:self.offsets[school_id + 1]]
+        if rok is None:
+            return block
+        years = block['Rok'].to_numpy()
+        return block.iloc[np.searchsorted(years, rok, 'left'):np.searchsorted(years, rok, 'right')]
+
+    def has_year(self, redizo, rok):
+        return (self.school_ids.get(redizo), rok) in self.school_years
+
+    def label(self, redizo):
+        return self.labels.get(redizo, str(redizo))
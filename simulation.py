@@ -0,0 +1,222 @@
+"""Monte Carlo simulace šancí na přijetí podle agregovaných dat o prioritách.
+
+Pro seznam přihlášek (až 3 obory v pořadí priorit) odhadne pravděpodobnost přijetí
+na každý z nich, případně pro každý obor ve výběru (kraj / město / obor) šanci
+přijetí, kdyby to byla jediná přihláška. Kapacity lze zadat jinak než v datech.
+
+Použití: python simulation.py --rok 2025 [--kraj "Hlavní město Praha"] [--obor Gymnázium]
+                              [--skill 0.75] [--capacity-change 10] [--rounds 2000]
+                              [--workers 4] [--out sance.csv]
+"""
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import analytics
+from memo import derived_cache
+
+# --- MODEL ---
+# Data jsou jen součty za obor (škola x obor), ne jednotliví uchazeči, proto každé kolo
+# simulace losuje konkurenci z těchto součtů:
+#   * podmínky splní podíl q = 1 - Duvod_Podminky / Prihlaseni (každý uchazeč stejně),
+#   * uchazeči s 1. prioritou zůstávají, ze 2. a 3. priority odejde na vyšší prioritu
+#     podíl o = Duvod_Vyssi_Priorita / (q * (P2 + P3)) -> konkurence
+#     N ~ Bin(P1 * d, q) + Bin((P2 + P3) * d, q * (1 - o)),
+#     d = náhodná změna poptávky proti loňsku (lognormální, DEMAND_SIGMA),
+#   * uchazeč má percentil a (podíl konkurentů s horším výsledkem); neznámý -> a ~ U(0, 1),
+#     zadaný -> a ~ N(skill, SKILL_SIGMA) (výkyv v den zkoušky),
+#   * přijat je, když splní podmínky a lepších konkurentů Bin(N, 1 - a) je méně než kapacita.
+# Se seznamem priorit skončí uchazeč na první přihlášce (v pořadí), kam by byl přijat.
+# Percentil je v jednom kole stejný pro všechny přihlášky, takže šance nejsou nezávislé.
+# Kontrola: šance jediné přihlášky při neznámém percentilu odpovídá historické úspěšnosti
+# uchazečů s 1. prioritou (Uspesnost_P1_Pct = Prijati_P1 / Prihlaseni_P1), v datech 2025
+# korelace 0,94 a průměr 63,5 % vs. 64,8 % (obory s aspoň 20 přihláškami v 1. prioritě).
+#
+# Všechna kola se počítají najednou jako pole (kola x obory). Rozptyl odhadu (p05 / p95)
+# je přes SIM_BATCHES stejně velkých dávek kol. Výsledky jsou memoizované podle
+# (rok, seznam oborů / výběr, změny kapacit, parametry simulace); pevný seed -> stejný
+# vstup dá stejný výsledek.
+DEFAULT_ROUNDS = 20_000
+REGION_ROUNDS = 2_000
+DEMAND_SIGMA = 0.1
+SKILL_SIGMA = 0.05
+SIM_BATCHES = 20
+# Oborů na jeden blok výpočtu v regionálním běhu (a jednu úlohu pro proces)
+REGION_CHUNK = 256
+SKILL_BANDS = np.linspace(0, 1, 11)
+
+def program_params(rows, overrides=()):
+    # Parametry modelu pro obory (řádky df_final); overrides = ((unit_id, kapacita), ...)
+    applicants = rows['Prihlaseni'].to_numpy(dtype='float64')
+    later = (rows['Prihlaseni_P2'] + rows['Prihlaseni_P3']).to_numpy(dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pass_rate = np.where(applicants > 0, 1 - rows['Duvod_Podminky'].to_numpy() / applicants, 1.0)
+        pass_rate = np.clip(pass_rate, 0, 1)
+        outflow = np.where(later * pass_rate > 0, rows['Duvod_Vyssi_Priorita'].to_numpy() / (later * pass_rate), 0.0)
+    capacity = rows['Kapacita'].to_numpy(dtype='int64').copy()
+    if overrides:
+        new_capacity = dict(overrides)
+        unit_ids = rows['unit_id'].to_numpy()
+        for i, unit_id in enumerate(unit_ids):
+            if unit_id in new_capacity:
+                capacity[i] = new_capacity[unit_id]
+    return {
+        'first': rows['Prihlaseni_P1'].to_numpy(dtype='float64'),
+        'later': later,
+        'pass_rate': pass_rate,
+        'outflow': np.clip(outflow, 0, 1),
+        'capacity': capacity,
+    }
+
+
+def draw_skill(rounds, skill, rng):
+    if skill is None:
+        return rng.random(rounds)
+    return np.clip(rng.normal(skill, SKILL_SIGMA, rounds), 0, 1)
+
+
+def draw_admissions(params, skill, rng, demand_sigma=DEMAND_SIGMA):
+    # Přijetí (bool, kola x obory) pro percentily uchazeče `skill` (pole délky kol)
+    rounds = len(skill)
+    demand = rng.lognormal(0, demand_sigma, (rounds, 1))
+    first = rng.binomial(np.rint(params['first'] * demand).astype('int64'), params['pass_rate'])
+    later = rng.binomial(np.rint(params['later'] * demand).astype('int64'),
+                         params['pass_rate'] * (1 - params['outflow']))
+    better = rng.binomial(first + later, 1 - skill[:, None])
+    passed = rng.random(better.shape) < params['pass_rate']
+    return passed & (better < params['capacity'])
+
+
+def batch_stats(hits):
+    # hits: bool (kola x sloupce) -> (průměr, p05, p95) v % přes dávky kol
+    batches = hits[:len(hits) // SIM_BATCHES * SIM_BATCHES].reshape(SIM_BATCHES, -1, hits.shape[1]).mean(axis=1)
+    p05, p95 = np.percentile(batches, [5, 95], axis=0)
+    return hits.mean(axis=0) * 100, p05 * 100, p95 * 100
+
+
+def normalize_overrides(overrides):
+    # Klíč cache: seřazené dvojice (unit_id, kapacita) s celými čísly
+    return tuple(sorted((int(unit_id), int(capacity)) for unit_id, capacity in dict(overrides).items()))
+
+
+@derived_cache.memoize
+def simulate(tables, rok, units, overrides=(), skill=None, rounds=DEFAULT_ROUNDS, seed=0):
+    # Seznam přihlášek `units` (unit_id v pořadí priorit) v roce `rok`. Vrací
+    # {'programs': tabulka po přihláškách, 'nezarazen_pct', 'by_skill' (jen pro neznámý percentil), 'rounds'}
+    df_final = analytics.final_table(tables, analytics.filter_state(rok))
+    rows = df_final.set_index('unit_id').loc[list(units)].reset_index()
+    params = program_params(rows, overrides)
+    rng = np.random.default_rng(seed)
+    a = draw_skill(rounds, skill, rng)
+    admitted = draw_admissions(params, a, rng)
+
+    # Umístění: první přihláška v pořadí, kam by byl přijat (poslední sloupec = nikam)
+    placed = np.zeros((rounds, len(units) + 1), dtype=bool)
+    first_hit = np.where(admitted.any(axis=1), admitted.argmax(axis=1), len(units))
+    placed[np.arange(rounds), first_hit] = True
+    mean, p05, p95 = batch_stats(placed)
+    alone = admitted.mean(axis=0) * 100
+
+    programs = pd.DataFrame({
+        'Priorita': np.arange(1, len(units) + 1),
+        'unit_id': rows['unit_id'].to_numpy(),
+        'Skola_Obor': rows['Skola_Obor'].to_numpy(),
+        'Kapacita': rows['Kapacita'].to_numpy(),
+        'Kapacita_Sim': params['capacity'],
+        'Prihlaseni': rows['Prihlaseni'].to_numpy(),
+        'Uspesnost_Pct': rows['Uspesnost_Pct'].to_numpy(),
+        'Uspesnost_P1_Pct': rows['Uspesnost_P1_Pct'].to_numpy(),
+        'Sance_Pct': mean[:-1],
+        'Sance_p05': p05[:-1],
+        'Sance_p95': p95[:-1],
+        'Sance_Samostatne_Pct': alone,
+    })
+    by_skill = None
+    if skill is None:
+        # Šance podle percentilu uchazeče (deciles), řádek = pásmo, sloupec = přihláška
+        band = np.clip(np.digitize(a, SKILL_BANDS[1:-1]), 0, len(SKILL_BANDS) - 2)
+        counts = np.bincount(band, minlength=len(SKILL_BANDS) - 1)[:, None]
+        sums = np.zeros((len(SKILL_BANDS) - 1, placed.shape[1]))
+        np.add.at(sums, band, placed)
+        labels = [f"{lo * 100:.0f}–{hi * 100:.0f} %" for lo, hi in zip(SKILL_BANDS[:-1], SKILL_BANDS[1:])]
+        by_skill = pd.DataFrame(sums / np.maximum(counts, 1) * 100,
+                                columns=[f"{i}. priorita" for i in range(1, len(units) + 1)] + ['Nepřijat'],
+                                index=pd.Index(labels, name='Percentil'))
+    return {'programs': programs, 'nezarazen_pct': float(mean[-1]), 'by_skill': by_skill, 'rounds': rounds}
+
+
+def _region_chunk(params, skill, rounds, seed):
+    # Jeden blok oborů: šance přijetí na každý obor jako jedinou přihlášku
+    rng = np.random.default_rng(seed)
+    admitted = draw_admissions(params, draw_skill(rounds, skill, rng), rng)
+    return batch_stats(admitted)
+
+
+@derived_cache.memoize
+def region_chances(tables, state, overrides=(), skill=None, rounds=REGION_ROUNDS, seed=0, workers=1):
+    # Šance na každý obor ve výběru (df_final) jako jedinou přihlášku. Bloky po REGION_CHUNK
+    # oborech mají vlastní seed podle pořadí -> výsledek nezávisí na počtu procesů.
+    df_final = analytics.final_table(tables, state)
+    params = program_params(df_final, overrides)
+    chunks = [({k: v[i:i + REGION_CHUNK] for k, v in params.items()}, skill, rounds, seed + n)
+              for n, i in enumerate(range(0, len(df_final), REGION_CHUNK))]
+    if workers > 1 and len(chunks) > 1:
+        method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method)) as pool:
+            results = list(pool.map(_region_chunk, *zip(*chunks)))
+    else:
+        results = [_region_chunk(*chunk) for chunk in chunks]
+
+    out = df_final[['unit_id', 'Skola_Obor', 'Obor', 'Okres', 'Kapacita', 'Prihlaseni',
+                    'Previs_Poptavky', 'Uspesnost_Pct', 'Uspesnost_P1_Pct']].copy()
+    out['Kapacita_Sim'] = params['capacity']
+    for i, col in enumerate(['Sance_Pct', 'Sance_p05', 'Sance_p95']):
+        out[col] = np.concatenate([r[i] for r in results]) if results else np.zeros(0)
+    return out.sort_values('Sance_Pct', ignore_index=True)
+
+
+def capacity_overrides(rows, change_pct):
+    # Změna kapacity o change_pct % u všech zadaných oborů (řádky df_final)
+    capacity = np.rint(rows['Kapacita'].to_numpy() * (1 + change_pct / 100)).astype('int64')
+    return normalize_overrides(zip(rows['unit_id'].to_numpy(), np.maximum(capacity, 0)))
+
+
+def main():
+    import etl
+    import filter_index
+    import store
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rok', type=int)
+    parser.add_argument('--kraj', nargs='+')
+    parser.add_argument('--mesto', nargs='+')
+    parser.add_argument('--obor', nargs='+')
+    parser.add_argument('--skill', type=float, help="percentil uchazeče 0-1 (výchozí neznámý)")
+    parser.add_argument('--capacity-change', type=float, default=0, help="změna kapacit všech oborů v %%")
+    parser.add_argument('--rounds', type=int, default=REGION_ROUNDS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--out', help="CSV s výsledky (jinak výpis 10 oborů s nejnižší šancí)")
+    args = parser.parse_args()
+
+    tables = store.load_tables() if store.open_store() else etl.load_tables()
+    tables['filter_index'] = filter_index.FilterIndex.from_tables(tables)
+    rok = args.rok or int(tables['cube']['Rok'].max())
+    state = analytics.filter_state(rok, args.kraj, args.mesto, args.obor)
+    overrides = ()
+    if args.capacity_change:
+        overrides = capacity_overrides(analytics.final_table(tables, state), args.capacity_change)
+    result = region_chances(tables, state, overrides, args.skill, args.rounds, args.seed, args.workers)
+    if args.out:
+        result.to_csv(args.out, index=False)
+        print(f"{len(result)} oborů -> {args.out}")
+    else:
+        print(result.head(10).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+import os
+import threading
+
+import pandas as pd
+
+from memo import derived_cache
+
+try:
+    import duckdb
+except ImportError:  # volitelná závislost: pip install duckdb
+    duckdb = None
+
+# --- VOLITELNÝ SQL BACKEND (DuckDB nad Parquet partitions úložiště) ---
+# Stejné dotazy jako pandas větev v analytics.py (kapacita z 1. kola + metriky přes
+# všechna kola po jednotkách škola x obor x lokalita, souhrny po oborech, meziroční
+# součty, benchmark školy), ale spočítané vestavěným sloupcovým enginem přímo nad
+# soubory v store/ -> řádková data nemusí být v paměti procesu.
+#
+# Filtry ze sidebaru se posílají do dotazu: rok vybírá jen soubory příslušných
+# partitions, kraj / město / obor jdou do WHERE, které DuckDB protlačí do čtení
+# Parquetu (statistiky row-groups). Výsledkem jsou jen součty; celočíselné klíče
+# a popisky se dotahují z dimenzí v paměti (jsou malé), metriky a meziroční změny
+# dopočítá analytics.py stejným kódem jako u pandas.
+#
+# Zapíná se proměnnou prostředí JPZ_BACKEND=duckdb (výchozí 'pandas'). Bez
+# nainstalovaného duckdb nebo u dat načtených přímo z CSV (bez úložiště) se
+# použije pandas. Shoda s pandas: python benchmarks/sql_backend.py
+BACKEND = os.environ.get('JPZ_BACKEND', 'pandas')
+
+# Klíč jednotky v řádkových datech (škola x obor x lokalita), viz etl.build_dimensions
+UNIT_KEYS = ['REDIZO', 'Obor', 'Kraj', 'Okres', 'Město']
+# Součtové sloupce jednotky (analytics.SUM_COLS); kapacita jen z 1. kola
+UNIT_SUMS = """
+    sum(CASE WHEN Kolo = 1 THEN Kapacita ELSE 0 END) AS Kapacita,
+    sum(Prihlaseni) AS Prihlaseni, sum(Prijati) AS Prijati,
+    sum(Prihlaseni_P1) AS Prihlaseni_P1, sum(Prihlaseni_P2) AS Prihlaseni_P2,
+    sum(Prihlaseni_P3) AS Prihlaseni_P3, sum(Prijati_P1) AS Prijati_P1,
+    sum(Duvod_Kapacita) AS Duvod_Kapacita, sum(Duvod_Podminky) AS Duvod_Podminky,
+    sum(Duvod_Vyssi_Priorita) AS Duvod_Vyssi_Priorita,
+    bool_or(Kolo = 1) AS Ma_Kolo1"""
+SUM_NAMES = ['Kapacita', 'Prihlaseni', 'Prijati', 'Prihlaseni_P1', 'Prihlaseni_P2', 'Prihlaseni_P3',
+             'Prijati_P1', 'Duvod_Kapacita', 'Duvod_Podminky', 'Duvod_Vyssi_Priorita']
+# Platná jednotka (df_final): řádek v 1. kole a nenulová kapacita (analytics.build_cube)
+VALID = "Ma_Kolo1 AND Kapacita > 0"
+
+_local = threading.local()
+_lock = threading.Lock()
+_connection = None
+_connection_pid = None
+
+
+def active(tables):
+    return BACKEND == 'duckdb' and duckdb is not None and 'files' in tables
+
+
+def _cursor():
+    # Jedno spojení na proces (po forku v report.py nové), každé vlákno (session) má vlastní kurzor
+    global _connection, _connection_pid
+    with _lock:
+        if _connection is None or _connection_pid != os.getpid():
+            _connection, _connection_pid = duckdb.connect(), os.getpid()
+        if getattr(_local, 'pid', None) != _connection_pid:
+            _local.cursor, _local.pid = _connection.cursor(), _connection_pid
+    return _local.cursor
+
+
+@derived_cache.memoize
+def unit_ids(tables):
+    # Klíč jednotky v řádkových datech -> celočíselné klíče z dimenzí
+    unit = tables['dim_unit']
+    school = tables['dim_school'].take(unit['school_id'].to_numpy())
+    obor = tables['dim_obor'].take(unit['obor_id'].to_numpy())
+    loc = tables['dim_location'].take(unit['location_id'].to_numpy())
+    return pd.DataFrame({
+        'REDIZO': school['REDIZO'].to_numpy(),
+        'Obor': obor['Obor'].astype(str).to_numpy(),
+        'Kraj': loc['Kraj'].astype(str).to_numpy(),
+        'Okres': loc['Okres'].astype(str).to_numpy(),
+        'Město': loc['Město'].astype(str).to_numpy(),
+        'unit_id': unit['unit_id'].to_numpy(),
+        'school_id': unit['school_id'].to_numpy(),
+        'obor_id': unit['obor_id'].to_numpy(),
+        'location_id': unit['location_id'].to_numpy(),
+    })
+
+
+def _source(tables, state, rok=None):
+    # FROM + WHERE nad řádkovými daty: soubory jen pro vybraný rok, ostatní filtry do WHERE
+    files = [f['path'] for f in tables['files'] if rok is None or f['Rok'] == rok]
+    where, params = [], [files]
+    if rok is not None:
+        where.append("Rok = ?")
+        params.append(rok)
+    for col, values in [('Kraj', state.kraj), ('"Město"', state.mesto), ('Obor', state.obor)]:
+        if values:
+            where.append(f"{col} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    sql = "read_parquet(?)" + (" WHERE " + " AND ".join(where) if where else "")
+    return f"SELECT * FROM {sql}", params
+
+
+def _units(tables, state, rok=None):
+    source, params = _source(tables, state, rok)
+    keys = ', '.join(f'"{col}"' for col in UNIT_KEYS)
+    return f"units AS (SELECT Rok, {keys}, {UNIT_SUMS} FROM ({source}) GROUP BY ALL)", params
+
+
+def _query(tables, sql, params):
+    cur = _cursor()
+    cur.register('unit_ids', unit_ids(tables))
+    try:
+        return cur.execute(sql, params).df()
+    finally:
+        cur.unregister('unit_ids')
+
+
+def unit_sums(tables, state):
+    # Platné jednotky vybraného roku: celočíselné klíče + SUM_COLS (vstup pro analytics.final_view)
+    units, params = _units(tables, state, state.rok)
+    sql = f"""WITH {units}
+        SELECT k.unit_id, k.school_id, k.obor_id, k.location_id, {', '.join(f'u.{c}' for c in SUM_NAMES)}
+        FROM units u JOIN unit_ids k USING ({', '.join(f'"{col}"' for col in UNIT_KEYS)})
+        WHERE {VALID}"""
+    df = _query(tables, sql, params)
+    return df.astype({col: 'int64' for col in SUM_NAMES})
+
+
+def obor_sums(tables, state):
+    # Souhrn platných jednotek vybraného roku po oborech (analytics.obory_table)
+    units, params = _units(tables, state, state.rok)
+    sql = f"""WITH {units}
+        SELECT Obor, {', '.join(f'sum({c}) AS {c}' for c in SUM_NAMES)}
+        FROM units WHERE {VALID} GROUP BY Obor ORDER BY Obor"""
+    df = _query(tables, sql, params)
+    return df.astype({col: 'int64' for col in SUM_NAMES})
+
+
+def yoy_sums(tables, state):
+    # Součty po oborech pro každou dvojici po sobě jdoucích let, ze všech jednotek
+    # (i mimo df_final) -> stejné sloupce jako analytics.year_deltas před delta_changes
+    units, params = _units(tables, state)
+    sums = ['Pocet', 'Prihlaseni', 'Prijati', 'Kapacita', 'Prihlaseni_P1']
+    per_year = "count(*) AS Pocet, sum(Prihlaseni) AS Prihlaseni, sum(Prijati) AS Prijati, " \
+               "sum(Kapacita) AS Kapacita, sum(Prihlaseni_P1) AS Prihlaseni_P1"
+    sides = ', '.join(f"sum(CASE WHEN y.Rok = p.Rok_{side} THEN y.{col} ELSE 0 END) AS {col}_{side}"
+                      for side in ['Od', 'Do'] for col in sums)
+    sql = f"""WITH {units},
+        y AS (SELECT Obor, Rok, {per_year} FROM units GROUP BY Obor, Rok),
+        years AS (SELECT DISTINCT Rok FROM y),
+        pairs AS (SELECT Rok - 1 AS Rok_Od, Rok AS Rok_Do FROM years WHERE Rok - 1 IN (SELECT Rok FROM years))
+        SELECT p.Rok_Od, p.Rok_Do, y.Obor, {sides}
+        FROM pairs p JOIN y ON y.Rok IN (p.Rok_Od, p.Rok_Do)
+        GROUP BY ALL ORDER BY Rok_Do, Obor"""
+    df = _query(tables, sql, params)
+    return df.astype({col: 'int64' for col in df.columns if col != 'Obor'})
+
+
+def benchmark_sums(tables, state, redizo):
+    # Konkurence školy: platné jednotky výběru ve stejných oborech, bez školy samotné
+    # -> (počet, kapacita, přihlášky, přijatí) jako analytics._scan_benchmark
+    units, params = _units(tables, state, state.rok)
+    sql = f"""WITH {units},
+        valid AS (SELECT * FROM units WHERE {VALID})
+        SELECT count(*), coalesce(sum(Kapacita), 0), coalesce(sum(Prihlaseni), 0), coalesce(sum(Prijati), 0)
+        FROM valid
+        WHERE Obor IN (SELECT Obor FROM valid WHERE REDIZO = ?) AND REDIZO <> ?"""
+    cur = _cursor()
+    return tuple(int(v) for v in cur.execute(sql, params + [redizo, redizo]).fetchone())
@@ -0,0 +1,273 @@
+"""Particionované úložiště dat přijímacího řízení (jedna partition na Rok x Kolo).
+
+Nový export (typicky další ročník nebo kolo) se přidá příkazem ingest, který
+zpracuje jen nový soubor, zapíše jeho partitions a přírůstkově aktualizuje
+kanonické názvy škol. Existující partitions se nikdy nepřepisují.
+
+Použití: python store.py ingest <export.csv> [--store store]
+         python store.py list [--store store]
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import pandas as pd
+
+import etl
+
+# --- ROZLOŽENÍ ÚLOŽIŠTĚ ---
+#   store/manifest.json                 partitions (Rok, Kolo, cesta, řádky, SHA-256) + verze úložiště,
+#                                       verze ETL a otisky ingestovaných exportů
+#   store/Rok=2025/Kolo=1/data.parquet  vyčištěné řádky exportu (etl.normalize_source)
+#   store/names.parquet                 kanonický název školy pro každé REDIZO (etl.canonical_names)
+#   store/rejected/<export>.csv         řádky exportu zamítnuté validací (etl.stream_source)
+#   store/.cache/                       odvozené tabulky pro konkrétní sadu let (jako cache v etl.py)
+# Kanonické názvy se na partitions aplikují až při načtení, takže škola má stejný
+# název v každém pohledu bez ohledu na to, které roky se načetly.
+#
+# Úložiště je odvozené ze zdrojových exportů, do gitu nepatří (.gitignore).
+#
+# Konfigurace přes proměnnou prostředí JPZ_STORE_DIR (výchozí 'store').
+STORE_DIR = os.environ.get('JPZ_STORE_DIR', 'store')
+MANIFEST_NAME = 'manifest.json'
+NAMES_NAME = 'names.parquet'
+
+
+def partition_path(rok, kolo):
+    return f"Rok={rok}/Kolo={kolo}/data.parquet"
+
+
+def read_manifest(store_dir=STORE_DIR):
+    return etl._read_meta(os.path.join(store_dir, MANIFEST_NAME))
+
+
+def _write_parquet(df, path):
+    # Dočasný soubor + os.replace -> čtenář nikdy neuvidí polovičatý soubor
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = etl.tmp_path(path)
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return etl.file_digest(path)
+
+
+def _store_version(partitions, names_sha256):
+    # Verze úložiště = obsah všech partitions + mapování názvů
+    h = hashlib.sha256(names_sha256.encode())
+    for p in sorted(partitions, key=lambda p: (p['Rok'], p['Kolo'])):
+        h.update(p['sha256'].encode())
+    return h.hexdigest()
+
+
+def rejected_path(csv_path, store_dir=STORE_DIR):
+    return os.path.join(store_dir, 'rejected', os.path.basename(csv_path))
+
+
+def ingest(csv_path, store_dir=STORE_DIR):
+    # Vrací (přidané partitions, report validace)
+    manifest = read_manifest(store_dir) or {'partitions': [], 'etl_version': etl.ETL_VERSION}
+    if manifest.get('etl_version') != etl.ETL_VERSION:
+        raise ValueError(f"Úložiště {store_dir} je z jiné verze ETL, založte ho znovu ze všech exportů")
+    existing = {(p['Rok'], p['Kolo']) for p in manifest['partitions']}
+
+    # Export se čte po blocích, validuje a rovnou redukuje na součty za jednotky
+    report_path = rejected_path(csv_path, store_dir)
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    df, report = etl.stream_source(csv_path, report_path)
+    source = os.path.basename(csv_path)
+    fingerprint = etl.source_fingerprint(csv_path)
+    groups = df.groupby(['Rok', 'Kolo'], sort=True)
+    clash = sorted(set(groups.groups) & existing)
+    if clash:
+        names = ", ".join(f"Rok={rok}/Kolo={kolo}" for rok, kolo in clash)
+        raise ValueError(f"Partition {names} už v úložišti je, existující partitions se nepřepisují")
+
+    added = []
+    for (rok, kolo), part in groups:
+        path = partition_path(rok, kolo)
+        sha256 = _write_parquet(part, os.path.join(store_dir, path))
+        added.append({'Rok': int(rok), 'Kolo': int(kolo), 'path': path, 'rows': len(part),
+                      'sha256': sha256, 'source': source})
+
+    # Kanonické názvy: staré mapování + kandidáti jen z nového souboru
+    names_path = os.path.join(store_dir, NAMES_NAME)
+    candidates = etl.name_candidates(df)
+    if os.path.exists(names_path):
+        candidates = pd.concat([pd.read_parquet(names_path), candidates], ignore_index=True)
+    names_sha256 = _write_parquet(etl.canonical_names(candidates), names_path)
+
+    # Manifest až nakonec -> platný manifest vždy odkazuje na kompletní partitions
+    partitions = manifest['partitions'] + added
+    etl._write_meta(os.path.join(store_dir, MANIFEST_NAME), {
+        'partitions': partitions,
+        'names_sha256': names_sha256,
+        'version': _store_version(partitions, names_sha256),
+        'etl_version': etl.ETL_VERSION,
+        'sources': {**manifest.get('sources', {}), source: fingerprint},
+    })
+    return added, report
+
+
+# --- ZALOŽENÍ ÚLOŽIŠTĚ ZE ZDROJOVÉHO CSV ---
+# Jako Parquet cache v etl.py: úložiště se založí z data.csv, pokud neexistuje, a znovu,
+# pokud se od založení změnil obsah data.csv nebo verze ETL (otisk v manifestu).
+# Znovu založit jde jen úložiště, které obsahuje pouze data.csv; s dalšími ingestovanými
+# exporty se přegeneruje ručně a do té doby aplikace čte přímo CSV.
+# Nové úložiště vznikne v dočasném adresáři a na místo starého se přesune až celé.
+_seed_lock = threading.Lock()
+# Neúspěšná založení (klíč: úložiště + stav CSV) -> důvod; stejný pokus se při každém
+# rerunu neopakuje (ingest celého CSV), jen se znovu ohlásí
+_seed_failures = {}
+
+
+def _seed_state(manifest, csv_path, store_dir):
+    # 'ok' | 'seed' (založit z CSV) | 'manual' (úložiště s dalšími exporty je zastaralé)
+    if manifest is None:
+        return 'seed'
+    source = os.path.basename(csv_path)
+    seeded = [p for p in manifest['partitions'] if p['source'] == source]
+    current = manifest.get('etl_version') == etl.ETL_VERSION
+    if current and seeded:
+        # Hash se počítá, jen když nesedí velikost nebo mtime (etl.source_fingerprint)
+        recorded = manifest.get('sources', {}).get(source)
+        fingerprint = etl.source_fingerprint(csv_path, recorded)
+        current = recorded is not None and fingerprint['sha256'] == recorded['sha256']
+        if current and fingerprint != recorded:
+            # Obsah stejný, jen jiný mtime (např. git checkout) -> obnovíme otisk
+            try:
+                etl._write_meta(os.path.join(store_dir, MANIFEST_NAME),
+                                {**manifest, 'sources': {**manifest['sources'], source: fingerprint}})
+            except OSError:
+                pass
+    if current:
+        return 'ok'
+    return 'seed' if len(seeded) == len(manifest['partitions']) else 'manual'
+
+
+def _seed(store_dir, csv_path):
+    parent = os.path.dirname(os.path.abspath(store_dir))
+    new_dir = tempfile.mkdtemp(prefix='.store-', dir=parent)
+    try:
+        ingest(csv_path, new_dir)
+        old_dir = None
+        if os.path.exists(store_dir):
+            old_dir = tempfile.mkdtemp(prefix='.store-old-', dir=parent)
+            os.rename(store_dir, os.path.join(old_dir, 'store'))
+        os.rename(new_dir, store_dir)
+        if old_dir:
+            shutil.rmtree(old_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(new_dir, ignore_errors=True)
+
+
+def open_store(store_dir=STORE_DIR, csv_path=etl.CSV_PATH, warn=None):
+    # Manifest úložiště (podle potřeby založeného z CSV), nebo None -> aplikace čte přímo CSV.
+    # Proč se úložiště nepoužije (read-only souborový systém, export neprojde validací,
+    # zastaralé úložiště s dalšími exporty), se předá do warn(zpráva), např. st.warning.
+    with _seed_lock:
+        manifest = read_manifest(store_dir)
+        if not os.path.exists(csv_path):
+            return manifest
+        stat = os.stat(csv_path)
+        key = (os.path.abspath(store_dir), os.path.abspath(csv_path), stat.st_size, stat.st_mtime_ns,
+               manifest and manifest['version'])
+        problem = _seed_failures.get(key)
+        if problem is None:
+            state = _seed_state(manifest, csv_path, store_dir)
+            if state == 'ok':
+                return manifest
+            if state == 'manual':
+                problem = (f"Úložiště {store_dir} neodpovídá aktuálnímu {os.path.basename(csv_path)} nebo verzi ETL "
+                           "a obsahuje i další exporty. Data se čtou přímo z CSV; úložiště založte znovu "
+                           "(smazat adresář a python store.py ingest pro každý export).")
+            else:
+                try:
+                    _seed(store_dir, csv_path)
+                    return read_manifest(store_dir)
+                except (OSError, ValueError) as e:
+                    problem = f"Úložiště {store_dir} nelze založit z {csv_path} ({e}). Data se čtou přímo z CSV."
+            _seed_failures[key] = problem
+    if warn:
+        warn(problem)
+    return None
+
+
+def store_years(manifest):
+    return sorted({p['Rok'] for p in manifest['partitions']})
+
+
+def view_years(years, rok):
+    # Pohled potřebuje vybraný rok a rok předchozí (meziroční srovnání, trend školy).
+    # Nejstarší rok předchůdce nemá, vezmeme následující rok (analytics.yoy_pair
+    # pak ukáže nejbližší dvojici jako dřív nad celou historií).
+    prev = [y for y in years if y < rok]
+    if prev:
+        return prev[-1], rok
+    return tuple(y for y in years if y >= rok)[:2]
+
+
+def load_tables(years=None, store_dir=STORE_DIR, use_cache=True):
+    # Načte jen partitions vybraných let (None = všechny) a postaví z nich tabulky jako etl.run_etl
+    manifest = read_manifest(store_dir)
+    partitions = [p for p in manifest['partitions'] if years is None or p['Rok'] in years]
+    key = _store_version(partitions, manifest['names_sha256'])
+    cache_dir = os.path.join(store_dir, etl.CACHE_DIR_NAME)
+    prefix = os.path.join(cache_dir, key[:16])
+    meta_path = prefix + '.meta.json'
+    fingerprint = {'sha256': key, 'etl_version': etl.ETL_VERSION}
+
+    meta = etl._read_meta(meta_path) if use_cache else None
+    tables = None
+    if meta and all(meta.get(k) == v for k, v in fingerprint.items()):
+        tables = etl._read_cache(prefix, meta.get('tables', []))
+    if not tables:
+        df = pd.concat([pd.read_parquet(os.path.join(store_dir, p['path'])) for p in partitions],
+                       ignore_index=True)
+        df = etl.apply_canonical_names(df, pd.read_parquet(os.path.join(store_dir, NAMES_NAME)))
+        tables = etl.build_tables(df)
+        if use_cache:
+            etl._write_cache(tables, cache_dir, prefix, meta_path, fingerprint)
+    tables['version'] = etl._data_version(fingerprint)
+    # Soubory partitions pro SQL backend (sql_backend.py), který čte přímo z nich
+    tables['files'] = [{'Rok': p['Rok'], 'path': os.path.abspath(os.path.join(store_dir, p['path']))}
+                       for p in partitions]
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=['ingest', 'list'])
+    parser.add_argument('csv', nargs='?')
+    parser.add_argument('--store', default=STORE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        if not args.csv:
+            parser.error("ingest potřebuje cestu k CSV")
+        try:
+            added, report = ingest(args.csv, args.store)
+        except ValueError as e:
+            sys.exit(str(e))
+        print(f"Načteno {report['radky']} řádků, zamítnuto {report['zamitnuto']}, "
+              f"ponecháno s varováním {report['varovani']}")
+        for reason, n in report['duvody'].items():
+            print(f"  {reason}: {n}")
+        for reason, n in report['varovani_duvody'].items():
+            print(f"  varování - {reason}: {n}")
+        if report['zamitnuto'] or report['varovani']:
+            print(f"  report: {rejected_path(args.csv, args.store)}")
+        for p in added:
+            print(f"+ {p['path']}: {p['rows']} řádků")
+
+    manifest = read_manifest(args.store)
+    if manifest is None:
+        sys.exit(f"Úložiště {args.store} neexistuje")
+    for p in manifest['partitions']:
+        print(f"{p['path']:<32}{p['rows']:>8}  {p['source']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,496 @@
+import functools
+
+import pandas as pd
+import streamlit as st
+
+import analytics
+import charts
+import comparables
+import memo
+import perf
+import simulation
+
+# --- VYKRESLENÍ STRÁNEK ---
+# Každá sekce je samostatná funkce s explicitními vstupy. Sekce s vlastními widgety
+# jsou st.fragment: změna widgetu přepočítá jen daný fragment, ne celý skript
+# (filtry, agregace a ostatní grafy zůstanou, jak jsou).
+#   priority_sections -> multiselect škol (grafy priorit a důvodů nepřijetí)
+#   rejection_chart   -> přepínač "Zobrazit jako %" (jen graf důvodů nepřijetí)
+#   school_detail     -> výběr školy na stránce "Detail školy"
+# Samotné figury staví a cachují charts.py, tady je jen rozvržení a widgety.
+#
+# Přehled trhu je rozdělený do záložek se stavem (on_change="rerun"): spustí se jen
+# otevřená záložka, takže ostatní sekce se nepočítají ani neposílají do prohlížeče.
+# Výchozí je strategická matice, těžké meziroční srovnání se spočítá až po otevření.
+#
+# Vykreslení (st.plotly_chart / st.dataframe, včetně Styleru) je etapa měření
+# "render:<co>" (perf.py); stavbu grafů a tabulek měří memoizace (memo.py).
+OVERVIEW_SECTIONS = [
+    "Strategická matice",
+    "Priority a důvody nepřijetí",
+    "Oborová analýza",
+    "Meziroční srovnání",
+]
+
+
+# --- MĚŘENÍ (perf.py) A PANEL "VÝKON" ---
+# Panel je skrytý: zobrazí se s ?debug=1 v URL (nebo JPZ_DEBUG_PANEL=1) a ukazuje
+# rozpad posledního rerunu na etapy, samostatné reruny fragmentů od té doby a stav
+# memo cache. Záznamy běhů si drží session state (posledních PERF_RUNS_KEPT).
+PERF_RUNS_KEPT = 20
+
+
+def debug_enabled():
+    return perf.PANEL_DEFAULT or st.query_params.get('debug') == '1'
+
+
+def remember_run(summary):
+    if summary is not None and debug_enabled():
+        runs = st.session_state.setdefault('perf_runs', [])
+        runs.append(summary)
+        del runs[:-PERF_RUNS_KEPT]
+
+
+def measured_fragment(fn):
+    # st.fragment s měřením: při celém rerunu je fragment jednou z etap, samostatný
+    # rerun fragmentu (změna widgetu v něm) je vlastní běh
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if perf.active():
+            with perf.stage(fn.__name__):
+                return fn(*args, **kwargs)
+        perf.start_run(debug_enabled(), kind=fn.__name__)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            remember_run(perf.finish_run())
+    return st.fragment(wrapper)
+
+
+def stage_table(summary):
+    # Etapy v pořadí spuštění, vnoření odsazené tečkami
+    df = pd.DataFrame(summary['stages'], columns=['stage', 'depth', 'start_ms', 'ms', 'cache'])
+    df = df.sort_values(['start_ms', 'depth'], ignore_index=True)
+    return pd.DataFrame({
+        'Etapa': ['· ' * depth + name for depth, name in zip(df['depth'], df['stage'])],
+        'ms': df['ms'].round(1),
+        'Cache': df['cache'],
+    })
+
+
+def debug_panel(summary):
+    remember_run(summary)
+    runs = st.session_state.get('perf_runs', [])
+    with st.sidebar.expander("⏱️ Výkon (debug)", expanded=True):
+        if summary is None:
+            st.caption("Měření není zapnuté.")
+            return
+        top = [s for s in summary['stages'] if s['depth'] == 0]
+        st.caption(f"Rerun #{summary['id']}: {summary['ms']:.0f} ms celkem, "
+                   f"z toho etapy {sum(s['ms'] for s in top):.0f} ms")
+        st.dataframe(stage_table(summary), hide_index=True)
+        # Samostatné reruny fragmentů mezi předchozím a tímto celým rerunem
+        fragments = []
+        for run in reversed(runs[:-1]):
+            if run['kind'] == 'script':
+                break
+            fragments.insert(0, run)
+        if fragments:
+            st.markdown("**Reruny fragmentů** (od předchozího rerunu)")
+            st.dataframe(pd.DataFrame([{'Fragment': r['kind'], 'ms': round(r['ms'], 1), 'Etap': len(r['stages'])}
+                                       for r in fragments]), hide_index=True)
+        st.markdown("**Memo cache** (tabulky / grafy)")
+        st.dataframe(memo.derived_cache.stats())
+        st.dataframe(memo.figure_cache.stats())
+
+
+def render_overview(tables, filter_state, df_final):
+    st.header("Celkový přehled trhu")
+    
+    tab_matrix, tab_priority, tab_obory, tab_yoy = st.tabs(
+        OVERVIEW_SECTIONS, key="overview_section", on_change="rerun")
+    with tab_matrix:
+        if tab_matrix.open:
+            strategy_matrix(tables, filter_state, df_final)
+    with tab_priority:
+        if tab_priority.open:
+            priority_sections(tables, filter_state, df_final)
+    with tab_obory:
+        if tab_obory.open:
+            obory_section(tables, filter_state)
+    with tab_yoy:
+        if tab_yoy.open:
+            yoy_section(tables, filter_state)
+
+
+# Nad HEXBIN_POINT_THRESHOLD bodů je výchozí zobrazení matice agregace do košů
+# (hexbin) s drill-downem na jednotlivé body výběrem oblasti v grafu.
+# "Automaticky" volí podle velikosti aktuálního výběru při každé změně filtrů; ostatní
+# volby jsou ruční přepnutí (radio si hodnotu drží v session state, index by po prvním
+# vykreslení ignoroval).
+HEXBIN_POINT_THRESHOLD = 20000
+MATRIX_AUTO = "Automaticky"
+MATRIX_MODES = ["Jednotlivé obory", "Hustota (hexbin)"]
+
+
+@measured_fragment
+def strategy_matrix(tables, filter_state, df_final):
+    # --- A) SCATTER PLOT: Šance vs. Konkurence ---
+    st.subheader("1. Strategická matice: Šance vs. Konkurence")
+    st.info("💡 **Vlevo nahoře:** Vysoká šance, malá konkurence (Jistota). **Vpravo dole:** Velká konkurence, malá šance (Masakr).")
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        mode = st.radio("Zobrazení", [MATRIX_AUTO] + MATRIX_MODES, horizontal=True, key="matrix_mode")
+        if mode == MATRIX_AUTO:
+            mode = MATRIX_MODES[int(len(df_final) > HEXBIN_POINT_THRESHOLD)]
+        fig_hexbin = charts.matrix_hexbin(tables, filter_state) if mode == MATRIX_MODES[1] else None
+        if fig_hexbin is None:
+            fig_scatter = charts.matrix_scatter(tables, filter_state)
+            with perf.stage('render:matrix_scatter'):
+                st.plotly_chart(fig_scatter, width="stretch")
+        else:
+            # Drill-down: výběr košů (box / laso / klik) zobrazí jejich obory jako body
+            with perf.stage('render:matrix_hexbin'):
+                event = st.plotly_chart(
+                    fig_hexbin, width="stretch",
+                    on_select="rerun", selection_mode=("points", "box", "lasso"), key="matrix_hexbin")
+            selected_bins = tuple(sorted(event.selection.point_indices))
+            if selected_bins:
+                fig_points = charts.matrix_drilldown(tables, filter_state, selected_bins)
+                with perf.stage('render:matrix_drilldown'):
+                    st.plotly_chart(fig_points, width="stretch")
+            else:
+                st.caption("Vyberte v grafu oblast (box / laso) pro zobrazení jednotlivých oborů.")
+    
+    with col2:
+        st.markdown("### Top 'Jistoty'")
+        # Školy s převisem < 1.2 a úspěšností > 80%
+        with perf.stage('render:top_picks'):
+            st.dataframe(analytics.top_picks(df_final), hide_index=True)
+
+
+@measured_fragment
+def priority_sections(tables, filter_state, df_final):
+    # --- B) PRIORITY: Jak nás berou uchazeči ---
+    st.subheader("2. Analýza Priorit: Jsme první volba nebo záložní plán?")
+    
+    # Uživatel si může vybrat konkrétní školy pro detail
+    selected_schools = st.multiselect("Vyber školy pro detailní srovnání priorit", df_final['Skola_Obor'].unique(), max_selections=10)
+    # Normalizovaný výběr je součástí klíče cache grafů (charts.py)
+    selected_schools = tuple(sorted(selected_schools))
+    
+    if not selected_schools:
+        # Defaultně top 10 škol podle počtu přihlášek
+        st.caption("Zobrazuji TOP 10 škol dle počtu přihlášek (vyberte konkrétní výše).")
+    
+    fig_priority = charts.priority_figure(tables, filter_state, selected_schools)
+    with perf.stage('render:priority'):
+        st.plotly_chart(fig_priority, width="stretch")
+    # --- C) DŮVODY ZAMÍTNUTÍ ---
+    st.divider()
+    st.subheader("3. Proč to nevyšlo? (Důvody nepřijetí)")
+    
+    rejection_chart(tables, filter_state, selected_schools)
+
+
+@measured_fragment
+def rejection_chart(tables, filter_state, selected_schools):
+    # Přepínač pro relativní zobrazení (100% Stacked Bar)
+    show_relative = st.checkbox("Zobrazit jako % (Relativní rozložení důvodů)", value=False)
+    
+    fig_rejection = charts.rejection_figure(tables, filter_state, selected_schools, show_relative)
+    with perf.stage('render:rejection'):
+        st.plotly_chart(fig_rejection, width="stretch")
+    if show_relative:
+        st.caption("💡 **Interpretace:** Pokud dominuje fialová (Odliv), škola je často 'záložní volbou'. Pokud červená (Kapacita), je o školu reálný zájem.")
+
+
+def obory_section(tables, filter_state):
+    # --- D) OBOROVÁ ANALÝZA ---
+    st.subheader("4. Oborová analýza: Kde je největší nával?")
+    
+    # Agregace dle oborů (z kostky se stejným výřezem jako df_final)
+    fig_obory = charts.obory_figure(tables, filter_state)
+    with perf.stage('render:obory'):
+        st.plotly_chart(fig_obory, width="stretch")
+
+
+def yoy_section(tables, filter_state):
+    # --- F) MEZIROČNÍ SROVNÁNÍ ---
+    # Meziroční změny po oborech jsou materializované při načtení dat (analytics.yoy_tables
+    # je jen vybírá podle kraje/města/oboru); zobrazí se dvojice let končící vybraným rokem,
+    # případně poslední dostupná.
+    yoy = analytics.yoy_tables(tables, filter_state._replace(rok=None))
+    pair = analytics.yoy_pair(yoy, filter_state.rok)
+    
+    if pair is None:
+        st.subheader("5. Meziroční srovnání trendů")
+        st.info("Pro meziroční srovnání jsou potřeba data alespoň za dva po sobě jdoucí roky. Zkontrolujte filtry.")
+        return
+    
+    rok_od, rok_do = pair
+    od, do = str(rok_od), str(rok_do)
+    st.subheader(f"5. Meziroční srovnání trendů ({od} vs {do})")
+    
+    top_growers, top_losers = analytics.yoy_movers(yoy, pair)
+    
+    trend_format = {od: "{:.0f}", do: "{:.0f}", 'Zmena_Abs': "{:+.0f}", 'Zmena_Pct': "{:+.1f}%"}
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### 🚀 Skokani roku (Absolutní nárůst zájmu)")
+        with perf.stage('render:yoy_growers'):
+            st.dataframe(top_growers.style.format(trend_format))
+        
+    with col2:
+        st.markdown("#### 📉 Pokles zájmu")
+        with perf.stage('render:yoy_losers'):
+            st.dataframe(top_losers.style.format(trend_format))
+    
+    # Graf změny priorit (Dumbbell Plot)
+    st.markdown("#### Změna v prioritách uchazečů (Podíl 1. priorit)")
+    st.info(f"Graf ukazuje posun v tom, jak moc je obor pro uchazeče 'první volbou'. Šipka ukazuje změnu z roku {od} na {do}.")
+    
+    # Graf se staví jen pro top 20 oborů podle přihlášek (charts.dumbbell_figure)
+    fig_dumbbell = charts.dumbbell_figure(tables, filter_state._replace(rok=None), rok_do)
+    if fig_dumbbell is not None:
+        with perf.stage('render:dumbbell'):
+            st.plotly_chart(fig_dumbbell, width="stretch")
+    else:
+        st.warning("Nedostatek dat pro zobrazení grafu priorit (chybí data pro oba roky u top oborů).")
+
+
+@measured_fragment
+def school_detail(tables, filter_state, df_final):
+    selected_year = filter_state.rok
+    st.header("Detail vybrané školy")
+    
+    # Výběr školy (pokud není vybrána nahoře); školy jsou identifikované přes REDIZO,
+    # protože stejný název má víc škol ("Gymnázium"), v seznamu je popisek "Škola, Město"
+    index = tables['school_index']
+    all_schools = analytics.school_options(tables, filter_state)
+    
+    # --- Persistence Logic ---
+    if 'last_selected_school' not in st.session_state:
+        st.session_state.last_selected_school = None
+
+    # Try to find the last selected school in the new list
+    default_index = 0
+    if st.session_state.last_selected_school in all_schools:
+        default_index = all_schools.index(st.session_state.last_selected_school)
+    
+    if all_schools:
+        # Callback function to update session state immediately
+        def update_selected_school():
+            st.session_state.last_selected_school = st.session_state.school_selector
+            
+        detail_school = st.selectbox(
+            "Vyber školu pro detailní pohled", 
+            all_schools, 
+            index=default_index,
+            format_func=index.label,
+            key="school_selector",
+            on_change=update_selected_school
+        )
+        # Ensure session state is synced (in case of first load or other updates)
+        st.session_state.last_selected_school = detail_school
+    
+        if detail_school:
+            with perf.stage('school_metrics'):
+                # Řádky školy z indexu škol: stejné součty jako v df_final, navíc s loňskými přihláškami
+                df_school_final = analytics.school_table(tables, filter_state, detail_school)
+            
+                # Klíčové metriky
+                total_capacity = df_school_final['Kapacita'].sum()
+                total_applicants = df_school_final['Prihlaseni'].sum()
+                total_accepted = df_school_final['Prijati'].sum()
+            
+                # BENCHMARKING (Srovnání s trhem)
+                # Průměr konkurence ve stejných oborech (stejný kraj, pokud je vybrán), bez školy samotné
+                benchmark = analytics.school_benchmark(tables, filter_state, detail_school)
+                avg_previs = benchmark['avg_previs'] if benchmark else 0
+                avg_uspesnost = benchmark['avg_uspesnost'] if benchmark else 0
+            
+                # Metriky školy
+                school_previs = total_applicants / total_capacity if total_capacity > 0 else 0
+                school_uspesnost = total_accepted / total_applicants * 100 if total_applicants > 0 else 0
+            
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Celková kapacita", int(total_capacity))
+            
+            # Delta color: inverse (vyšší převis je pro školu 'dobře' z hlediska zájmu, ale pro žáka 'špatně'. 
+            # Z pohledu školy (analýza úspěšnosti): Vyšší převis = Větší zájem = Zelená.
+            col2.metric(
+                "Počet přihlášek (Převis)", 
+                f"{int(total_applicants)} ({school_previs:.2f}x)",
+                delta=f"{school_previs - avg_previs:.2f} vs trh",
+                delta_color="normal" # Zelená když je vyšší než trh (větší zájem)
+            )
+            
+            col3.metric(
+                "Úspěšnost přijetí", 
+                f"{school_uspesnost:.1f} %",
+                delta=f"{school_uspesnost - avg_uspesnost:.1f} % vs trh",
+                delta_color="inverse" # Červená když je vyšší (lehčí se dostat = menší prestiž?) nebo naopak? 
+                # Necháme inverse: Vyšší úspěšnost = Lehčí se dostat (méně výběrové).
+            )
+            
+            if benchmark:
+                st.caption(f"Benchmark: Průměr konkurence ve stejném regionu/oborech (Převis: {avg_previs:.2f}x, Úspěšnost: {avg_uspesnost:.1f}%)")
+            
+            # --- Meziroční srovnání oborů ---
+            # Loňské přihlášky a text "Meziroční změna" jsou předpočítané v indexu škol
+            prev_year = selected_year - 1
+            
+            # Defaultní sloupce
+            display_cols = ['Obor', 'Kapacita', 'Prihlaseni', 'Prijati', 'Previs_Poptavky', 'Uspesnost_Pct']
+            
+            if index.has_year(detail_school, prev_year):
+                # Vložíme sloupec Trend za Prihlaseni
+                display_cols = ['Obor', 'Kapacita', 'Prihlaseni', 'Meziroční změna', 'Prijati', 'Previs_Poptavky', 'Uspesnost_Pct']
+            else:
+                st.info(f"ℹ️ Pro rok {selected_year} není k dispozici srovnání s předchozím rokem ({prev_year}).")
+
+            # Tabulka oborů na škole
+            st.markdown("#### Nabízené obory a jejich statistiky")
+            
+            # Styling funkce
+            def color_trend(val):
+                if isinstance(val, str):
+                    if "↑" in val:
+                        return 'color: green'
+                    elif "↓" in val:
+                        return 'color: red'
+                return ''
+
+            # Aplikace stylu
+            df_display = df_school_final[display_cols].sort_values('Prihlaseni', ascending=False)
+            
+            styler = df_display.style
+            if 'Meziroční změna' in df_display.columns:
+                styler = styler.map(color_trend, subset=['Meziroční změna'])
+            
+            with perf.stage('render:school_obory'):
+                st.dataframe(
+                    styler,
+                    hide_index=True
+                )
+    
+            # --- Detailní grafy pro školu ---
+            st.markdown("#### Detailní analýza po oborech")
+            col_g1, col_g2 = st.columns(2)
+    
+            with col_g1:
+                fig_school_priority = charts.school_priority_figure(tables, filter_state, detail_school)
+                with perf.stage('render:school_priority'):
+                    st.plotly_chart(fig_school_priority, width="stretch")
+    
+            with col_g2:
+                fig_school_reject = charts.school_reject_figure(tables, filter_state, detail_school)
+                with perf.stage('render:school_reject'):
+                    st.plotly_chart(fig_school_reject, width="stretch")
+
+            comparables_section(tables, filter_state, df_school_final)
+
+        market_benchmark_section(tables, filter_state, all_schools)
+        admission_simulator(tables, filter_state, df_final)
+    else:
+        st.warning("Pro zobrazení detailu školy upravte filtry (žádná škola neodpovídá zadání).")
+
+
+def comparables_section(tables, filter_state, df_school):
+    # Nejpodobnější obory jiných škol podle metrik (k nejbližších sousedů, comparables.py).
+    # Expander se stavem: hledá se, až když ho uživatel otevře.
+    expander = st.expander("Srovnatelné obory jiných škol", key="comparables", on_change="rerun")
+    with expander:
+        if not expander.open:
+            return
+        index = tables['comparable_index']
+        programs = df_school.sort_values('Prihlaseni', ascending=False)
+        labels = dict(zip(programs['unit_id'].tolist(), programs['Skola_Obor'].tolist()))
+        col1, col2, col3 = st.columns([3, 1, 1])
+        unit_id = col1.selectbox("Obor školy", list(labels), format_func=labels.get, key="comparables_unit")
+        k = col2.number_input("Počet", 1, 50, comparables.DEFAULT_K, key="comparables_k")
+        same_obor = col3.checkbox("Jen stejný obor", True, key="comparables_same_obor")
+        with perf.stage('comparables'):
+            df_similar = index.neighbours(unit_id, filter_state.rok, int(k), same_obor)
+        with perf.stage('render:comparables'):
+            st.dataframe(df_similar[comparables.DISPLAY_COLS], hide_index=True)
+        st.caption("Podobnost podle převisu, úspěšnosti, podílu 1. priorit, indexu odlivu, skladby důvodů "
+                   "nepřijetí a kapacity (standardizované v rámci roku); obor v jiném kraji je dál. "
+                   "Vzdalenost 0 = stejné metriky.")
+        export = functools.partial(index.all_neighbours, filter_state.rok, int(k), same_obor, list(labels))
+        st.download_button(
+            "Stáhnout CSV (všechny obory školy)",
+            data=lambda: export().to_csv(index=False).encode('utf-8'),
+            file_name=f"podobne_obory_{filter_state.rok}.csv",
+            mime="text/csv",
+            on_click="ignore",
+        )
+
+
+def market_benchmark_section(tables, filter_state, schools):
+    # Srovnání všech škol ve výběru s trhem (leave-one-out, analytics.market_benchmark).
+    # Expander se stavem: tabulka se sestaví, až když ho uživatel otevře.
+    expander = st.expander("Srovnání všech škol s trhem (žebříček a export)", key="market_benchmark", on_change="rerun")
+    with expander:
+        if not expander.open:
+            return
+        df_schools = analytics.market_benchmark(tables, filter_state.rok)['schools']
+        df_schools = df_schools[df_schools['REDIZO'].isin(schools)].sort_values('Poradi_Previs')
+        st.caption("Trh = stejné obory bez školy samotné (v ČR / v kraji školy), resp. celý trh v ČR. "
+                   "Pořadí podle převisu vůči stejným oborům v ČR (1 = nejvíc nad trhem).")
+        with perf.stage('render:market_benchmark'):
+            st.dataframe(df_schools[analytics.BENCHMARK_DISPLAY_COLS], hide_index=True)
+        st.download_button(
+            "Stáhnout CSV",
+            data=lambda: df_schools.drop(columns=['school_id']).to_csv(index=False).encode('utf-8'),
+            file_name=f"benchmark_skol_{filter_state.rok}.csv",
+            mime="text/csv",
+            on_click="ignore",
+        )
+
+
+# Výsledek uchazeče u zkoušek jako percentil (podíl uchazečů s horším výsledkem)
+SKILL_LEVELS = {
+    "Neznámý (průměr přes všechny uchazeče)": None,
+    "Lepší než 90 % uchazečů": 0.9,
+    "Lepší než 75 % uchazečů": 0.75,
+    "Průměrný (50 %)": 0.5,
+    "Lepší než 25 % uchazečů": 0.25,
+}
+SIM_DISPLAY_COLS = ['Priorita', 'Skola_Obor', 'Kapacita_Sim', 'Prihlaseni', 'Uspesnost_P1_Pct',
+                    'Sance_Pct', 'Sance_p05', 'Sance_p95', 'Sance_Samostatne_Pct']
+
+
+@measured_fragment
+def admission_simulator(tables, filter_state, df_final):
+    # Šance na přijetí pro vlastní seznam přihlášek (Monte Carlo, simulation.py).
+    # Expander se stavem: simulace běží, až když ho uživatel otevře.
+    expander = st.expander("Šance na přijetí (simulace)", key="admission_simulator", on_change="rerun")
+    with expander:
+        if not expander.open:
+            return
+        labels = df_final.set_index('unit_id')['Skola_Obor']
+        units = st.multiselect("Přihlášky v pořadí priorit", [int(u) for u in labels.index],
+                               max_selections=3, format_func=labels.get, key="sim_units")
+        if not units:
+            st.caption("Vyberte 1–3 obory v pořadí, v jakém by byly na přihlášce.")
+            return
+        col1, col2 = st.columns(2)
+        level = col1.selectbox("Výsledek uchazeče u zkoušek", list(SKILL_LEVELS), key="sim_skill")
+        change = col2.slider("Změna kapacity vybraných oborů (%)", -50, 50, 0, step=5, key="sim_capacity")
+        overrides = simulation.capacity_overrides(df_final[df_final['unit_id'].isin(units)], change) if change else ()
+
+        result = simulation.simulate(tables, filter_state.rok, tuple(units), overrides, SKILL_LEVELS[level])
+        with perf.stage('render:simulation'):
+            st.dataframe(result['programs'][SIM_DISPLAY_COLS], hide_index=True)
+        st.metric("Nepřijat na žádnou z přihlášek", f"{result['nezarazen_pct']:.1f} %")
+        if result['by_skill'] is not None:
+            st.markdown("Šance podle výsledku uchazeče (percentil = kolik % uchazečů má horší výsledek)")
+            st.dataframe(result['by_skill'].style.format("{:.1f} %"))
+        st.caption(f"{result['rounds']} simulovaných kol podle kapacit, počtů přihlášek po prioritách a důvodů "
+                   "nepřijetí z vybraného roku. Sance_Pct = šance na přijetí právě sem (vyšší priority nevyšly), "
+                   "p05–p95 = rozptyl odhadu, Sance_Samostatne_Pct = šance, kdyby to byla jediná přihláška. "
+                   "Pro srovnání historická úspěšnost uchazečů s 1. prioritou (Uspesnost_P1_Pct).")